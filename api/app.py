@@ -32,6 +32,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from shared import celeryconfig
+from shared.celery_inspect import inspect_concurrently
 from shared.storage import get_storage
 
 # Create FastAPI application
@@ -107,6 +108,17 @@ def get_infer_result(file_suffix_identifier: str, pdf_name: str, parse_dir: str)
     return None
 
 
+def get_output_file_text(key: Optional[str]) -> Optional[str]:
+    """Read a worker output file from storage by its key (json_files entry)"""
+    if not key:
+        return None
+    try:
+        return get_storage().read_output_file(key).decode('utf-8')
+    except Exception as exc:
+        logger.debug("Could not read output file {} from storage: {}", key, exc)
+        return None
+
+
 @app.get("/")
 async def root():
     """Root endpoint with service metadata."""
@@ -338,19 +350,20 @@ async def parse_pdf(
 
                 if return_content_list:
                     # Get content_list from task result (as JSON string, consistent with middle_json and model_output)
-                    if 'json_files' in result:
-                        json_files = result['json_files']
-                        if isinstance(json_files, dict) and 'content_list_json' in json_files:
-                            content_list_path = json_files['content_list_json']
-                            if content_list_path and os.path.exists(content_list_path):
-                                with open(content_list_path, 'r', encoding='utf-8') as f:
-                                    file_result['content_list'] = f.read()
-                    if 'content_list' in result and 'content_list' not in file_result:
+                    if 'content_list' in result:
                         try:
                             file_result['content_list'] = json.dumps(result['content_list'], ensure_ascii=False)
                         except Exception:
                             pass
-                    else:
+                    if 'content_list' not in file_result:
+                        # Large content_lists are only kept in storage (MINERU_INLINE_CONTENT_LIST_MAX_BYTES),
+                        # read them through the storage key recorded by the worker (works for S3 too)
+                        json_files = result.get('json_files')
+                        if isinstance(json_files, dict):
+                            content_list_text = get_output_file_text(json_files.get('content_list_json'))
+                            if content_list_text is not None:
+                                file_result['content_list'] = content_list_text
+                    if 'content_list' not in file_result:
                         # Try to read from file system
                         if backend.startswith("pipeline"):
                             parse_dir = output_path / pdf_name / parse_method
@@ -529,6 +542,7 @@ async def parse_pdf(
 @app.get("/api/v1/tasks/{task_id}")
 async def get_task_status(task_id: str, upload_images: bool = Query(False, description="Whether to upload images to MinIO")):
     """Query task status and result."""
+    now = datetime.now().isoformat()
     try:
         result = AsyncResult(task_id, app=celery_app)
 
@@ -557,7 +571,7 @@ async def get_task_status(task_id: str, upload_images: bool = Query(False, descr
                 'error_message': None,
                 'retry_count': getattr(result, 'retries', 0)
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now
         }
 
         if result.successful():
@@ -625,12 +639,13 @@ async def get_task_status(task_id: str, upload_images: bool = Query(False, descr
             error_info = result.result if result.result else result.traceback
             response['task'].update({
                 'error_message': str(error_info) if error_info else 'Unknown error',
-                'completed_at': datetime.now().isoformat()
+                'completed_at': now
             })
 
         elif api_status == 'processing':
-            if hasattr(result, 'info') and result.info and isinstance(result.info, dict):
-                progress_info = result.info
+            # info is not cached for unfinished tasks, every access queries the backend
+            progress_info = result.info
+            if isinstance(progress_info, dict):
                 response['task'].update({
                     'file_name': progress_info.get('file_name'),
                     'backend': progress_info.get('backend'),
@@ -667,9 +682,9 @@ async def get_queue_stats():
     """Retrieve queue statistics."""
     try:
         inspect = celery_app.control.inspect()
-        active_tasks = inspect.active() or {}
-        scheduled_tasks = inspect.scheduled() or {}
-        reserved_tasks = inspect.reserved() or {}
+        active_tasks, scheduled_tasks, reserved_tasks = inspect_concurrently(
+            inspect, 'active', 'scheduled', 'reserved'
+        )
 
         active_count = sum(len(tasks) for tasks in active_tasks.values())
         pending_count = sum(len(tasks) for tasks in scheduled_tasks.values())
@@ -687,7 +702,9 @@ async def get_queue_stats():
             },
             'workers': {
                 'active_workers': len(active_tasks),
-                'total_workers': len(inspect.stats() or {})
+                # Every responding worker replies to these broadcasts (idle ones with an empty
+                # list), so their union covers the workers a separate stats() call would find
+                'total_workers': len(set(active_tasks) | set(scheduled_tasks) | set(reserved_tasks))
             },
             'timestamp': datetime.now().isoformat(),
             'note': 'Completed/failed counts not available in Celery. Only active tasks are tracked.'
@@ -707,39 +724,49 @@ async def list_tasks(
         inspect = celery_app.control.inspect()
         tasks = []
 
+        # Query active and waiting tasks together, as the status filter requires
+        queries = []
         if not status or status == 'processing':
-            active_tasks = inspect.active() or {}
+            queries.append('active')
+        if not status or status == 'pending':
+            queries.append('scheduled')
+        replies = dict(zip(queries, inspect_concurrently(inspect, *queries))) if queries else {}
+
+        # Stop building entries once the limit is reached
+        if 'active' in replies:
+            active_tasks = replies['active']
             for worker_name, worker_tasks in active_tasks.items():
-                for task in worker_tasks:
+                for task in worker_tasks[:limit - len(tasks)]:
+                    task_kwargs = task.get('kwargs') or {}
                     tasks.append({
                         'task_id': task['id'],
                         'status': 'processing',
                         'worker_id': worker_name,
-                        'file_name': task.get('kwargs', {}).get('file_name'),
-                        'backend': task.get('kwargs', {}).get('backend'),
+                        'file_name': task_kwargs.get('file_name'),
+                        'backend': task_kwargs.get('backend'),
                         'started_at': task.get('time_start'),
                         'created_at': None,
                         'priority': 0
                     })
 
-        if not status or status == 'pending':
-            scheduled_tasks = inspect.scheduled() or {}
+        if 'scheduled' in replies and len(tasks) < limit:
+            scheduled_tasks = replies['scheduled']
             for _, worker_tasks in scheduled_tasks.items():
-                for task in worker_tasks:
+                for task in worker_tasks[:limit - len(tasks)]:
+                    request = task['request']
+                    task_kwargs = request.get('kwargs') or {}
                     tasks.append({
-                        'task_id': task['request']['id'],
+                        'task_id': request['id'],
                         'status': 'pending',
                         'worker_id': None,
-                        'file_name': task['request'].get('kwargs', {}).get('file_name'),
-                        'backend': task['request'].get('kwargs', {}).get('backend'),
+                        'file_name': task_kwargs.get('file_name'),
+                        'backend': task_kwargs.get('backend'),
                         'created_at': None,
                         'started_at': None,
                         'priority': task.get('priority', 0),
                         'eta': task.get('eta')
                     })
 
-        tasks = tasks[:limit]
-
         return {
             'success': True,
             'tasks': tasks,
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+MinerU Celery Inspect Helpers
+Shared by the API and Worker services for queue and task listings.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+__all__ = ['inspect_concurrently']
+
+
+def inspect_concurrently(inspect, *methods: str) -> List[Dict[str, Any]]:
+    """Run several inspect broadcasts at once (each waits for worker replies); missing replies become {}"""
+    with ThreadPoolExecutor(max_workers=len(methods)) as executor:
+        futures = [executor.submit(getattr(inspect, method)) for method in methods]
+    return [future.result() or {} for future in futures]
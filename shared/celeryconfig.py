@@ -46,6 +46,26 @@ task_queues = {
     }
 }
 
+# Merge tasks spend their time waiting on chunk results, so they can be routed to their own
+# queue and served by a lightweight worker (threads pool, high concurrency) instead of holding
+# MinerU parsing slots. Defaults to the main queue.
+_merge_queue = os.getenv('MINERU_MERGE_QUEUE', '').strip() or _task_queue
+if _merge_queue == _task_queue:
+    _merge_routing_key = _task_routing_key
+else:
+    _merge_routing_key = f"{_task_routing_key}.merge"
+    task_queues[_merge_queue] = {
+        'exchange': _task_exchange,
+        'routing_key': _merge_routing_key,
+    }
+task_routes = {
+    'mineru.merge_chunk_results': {
+        'queue': _merge_queue,
+        'exchange': _task_exchange,
+        'routing_key': _merge_routing_key,
+    },
+}
+
 # Worker behaviour
 worker_max_tasks_per_child = int(os.getenv('WORKER_MAX_TASKS_PER_CHILD', 100))
 worker_prefetch_multiplier = int(os.getenv('WORKER_PREFETCH_MULTIPLIER', 1))
@@ -68,6 +88,10 @@ API_PORT = int(os.getenv('API_PORT', 8000))
 WORKER_NAME = os.getenv('WORKER_NAME', 'mineru-worker')
 WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', 2))
 WORKER_POOL = os.getenv('WORKER_POOL', '').strip()
+# Queues consumed by this worker (comma-separated), defaults to the task queue and the merge queue
+WORKER_QUEUES = os.getenv('WORKER_QUEUES', '').strip() or ','.join(dict.fromkeys([_task_queue, _merge_queue]))
+# Disable gossip/mingle/heartbeat (worker-to-worker chatter that grows with cluster size)
+WORKER_DISABLE_GOSSIP = os.getenv('WORKER_DISABLE_GOSSIP', 'false').lower() == 'true'
 
 # Paths
 TEMP_DIR = os.getenv('TEMP_DIR', '/tmp/mineru_temp')
@@ -77,3 +101,5 @@ OUTPUT_DIR = os.getenv('OUTPUT_DIR', '/tmp/mineru_output')
 MINERU_QUEUE = _task_queue
 MINERU_EXCHANGE = _task_exchange
 MINERU_ROUTING_KEY = _task_routing_key
+MINERU_MERGE_QUEUE = _merge_queue
+MINERU_MERGE_ROUTING_KEY = _merge_routing_key
@@ -8,7 +8,9 @@ Supports two storage modes:
 - s3: Use S3-compatible storage (e.g., MinIO), supports distributed deployment
 """
 import os
+import shutil
 import tempfile
+import threading
 from pathlib import Path
 from typing import Optional, BinaryIO, Union, List
 from contextlib import contextmanager
@@ -127,7 +129,7 @@ class StorageAdapter:
                 # File object
                 data.seek(0)
                 with self._fs.open(path, 'wb') as f:
-                    f.write(data.read())
+                    shutil.copyfileobj(data, f)
         else:
             # Local filesystem
             file_path = Path(path)
@@ -138,7 +140,38 @@ class StorageAdapter:
                 # File object
                 data.seek(0)
                 with open(file_path, 'wb') as f:
-                    f.write(data.read())
+                    shutil.copyfileobj(data, f)
+        
+        return path
+    
+    def save_temp_file_from_path(self, key: str, src_path: Union[str, Path]) -> str:
+        """
+        Save temporary file by moving a local file into storage
+        
+        Local storage renames the file into place (no copy on the same filesystem),
+        S3 storage streams the upload and removes the local file.
+        
+        Args:
+            key: File identifier (e.g., task_id/filename)
+            src_path: Local file path (consumed by this call)
+            
+        Returns:
+            File path (for subsequent operations)
+        """
+        path = self._get_temp_path(key)
+        
+        if self.storage_type == 's3':
+            self._fs.put_file(str(src_path), path)
+            Path(src_path).unlink()
+        else:
+            # Local filesystem
+            file_path = Path(path)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.replace(src_path, file_path)
+            except OSError:
+                # Different filesystem, fall back to copy + delete
+                shutil.move(str(src_path), str(file_path))
         
         return path
     
@@ -162,7 +195,7 @@ class StorageAdapter:
                 # File object
                 data.seek(0)
                 with self._fs.open(path, 'wb') as f:
-                    f.write(data.read())
+                    shutil.copyfileobj(data, f)
         else:
             # Local filesystem
             file_path = Path(path)
@@ -173,7 +206,7 @@ class StorageAdapter:
                 # File object
                 data.seek(0)
                 with open(file_path, 'wb') as f:
-                    f.write(data.read())
+                    shutil.copyfileobj(data, f)
         
         return path
     
@@ -192,6 +225,44 @@ class StorageAdapter:
         else:
             return Path(path).read_bytes()
     
+    def read_output_file(self, key: str) -> bytes:
+        """
+        Read output file saved with save_output_file
+        
+        Args:
+            key: File identifier (e.g., task_id/filename)
+            
+        Returns:
+            File content (bytes)
+        """
+        return self.read_file(self._get_output_path(key))
+    
+    def read_range(self, path: str, start: int, end: int) -> bytes:
+        """
+        Read a byte range of a file (ranged GET on S3, no full download)
+        
+        Args:
+            path: File path (S3 key or local path)
+            start: Start offset (inclusive)
+            end: End offset (exclusive)
+            
+        Returns:
+            File content in the range (shorter if the file ends earlier)
+        """
+        if self.storage_type == 's3':
+            return self._fs.cat_file(path, start=start, end=end)
+        else:
+            with open(path, 'rb') as f:
+                f.seek(start)
+                return f.read(end - start)
+    
+    def get_file_size(self, path: str) -> int:
+        """Get file size in bytes"""
+        if self.storage_type == 's3':
+            return self._fs.size(path)
+        else:
+            return Path(path).stat().st_size
+    
     @contextmanager
     def open_file(self, path: str, mode: str = 'rb'):
         """
@@ -244,7 +315,6 @@ class StorageAdapter:
                 if self._fs.exists(path):
                     self._fs.rm(path, recursive=True)
             else:
-                import shutil
                 if Path(path).exists():
                     shutil.rmtree(path)
             return True
@@ -303,24 +373,27 @@ class StorageAdapter:
             local_path: Local file path
             remote_path: Remote file path (S3 key or local path)
         """
-        data = Path(local_path).read_bytes()
         if self.storage_type == 's3':
-            self._fs.write_bytes(remote_path, data)
+            # Streamed upload, the file is never loaded into memory as a whole
+            self._fs.put_file(local_path, remote_path)
         else:
             # Local storage directly copies
             remote_file = Path(remote_path)
             remote_file.parent.mkdir(parents=True, exist_ok=True)
-            remote_file.write_bytes(data)
+            shutil.copyfile(local_path, remote_file)
 
 
 # Global storage adapter instance
 _storage_adapter: Optional[StorageAdapter] = None
+_storage_adapter_lock = threading.Lock()
 
 
 def get_storage() -> StorageAdapter:
-    """Get storage adapter instance (singleton pattern)"""
+    """Get storage adapter instance (singleton pattern, safe to call from worker threads)"""
     global _storage_adapter
     if _storage_adapter is None:
-        _storage_adapter = StorageAdapter()
+        with _storage_adapter_lock:
+            if _storage_adapter is None:
+                _storage_adapter = StorageAdapter()
     return _storage_adapter
 
@@ -7,11 +7,14 @@ import os
 import sys
 import json
 import gc
+import logging
+import re
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Tuple
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import traceback
+from operator import itemgetter
 from dotenv import load_dotenv
 from loguru import logger
 
@@ -23,8 +26,11 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from celery import Celery, states
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+from celery.result import AsyncResult, ResultSet
 from celery.utils.log import get_task_logger
 from shared import celeryconfig
+from shared.celery_inspect import inspect_concurrently
 from shared.storage import get_storage
 
 if os.getenv('MINERU_DEVICE_MODE') == None or os.getenv('MINERU_DEVICE_MODE') == '' or os.getenv('MINERU_DEVICE_MODE') == 'auto':
@@ -70,6 +76,26 @@ try:
 except ImportError:
     PYPDFIUM2_AVAILABLE = False
 
+# orjson for (de)serializing large content_list JSON, stdlib json is used as a fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# pybase64 (SIMD-accelerated, same API) for encoding images, stdlib base64 as a fallback
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# glibc malloc_trim, used to hand freed heap memory back to the OS after large tasks
+try:
+    import ctypes
+    _malloc_trim = ctypes.CDLL("libc.so.6").malloc_trim
+except (OSError, AttributeError):
+    _malloc_trim = None
+
 # Note: Using pypdfium2 for both page detection and PDF splitting
 # (MinerU already uses pypdfium2, so we reuse it to reduce dependencies)
 
@@ -93,11 +119,32 @@ logger = get_task_logger(__name__)
 OUTPUT_DIR = Path(celeryconfig.OUTPUT_DIR)
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# MinerU parse defaults and image handling, fixed for the lifetime of the worker process
+MINERU_DEFAULT_LANG = os.getenv('MINERU_LANG', 'ch')
+MINERU_DEFAULT_PARSE_METHOD = os.getenv('MINERU_PARSE_METHOD', 'auto')
+MINERU_FORMULA_ENABLE = os.getenv('MINERU_FORMULA_ENABLE', 'true').lower() == 'true'
+MINERU_TABLE_ENABLE = os.getenv('MINERU_TABLE_ENABLE', 'true').lower() == 'true'
+MINERU_EMBED_IMAGES_IN_MD = os.getenv('MINERU_EMBED_IMAGES_IN_MD', 'true').lower() == 'true'
+MINERU_INLINE_IMAGES_BASE64 = os.getenv('MINERU_INLINE_IMAGES_BASE64', 'false').lower() == 'true'
+MINERU_RETURN_IMAGES_BASE64 = os.getenv('MINERU_RETURN_IMAGES_BASE64', 'true').lower() == 'true'
+# Larger content_list JSON is left in output storage (json_files) instead of being put in the task result
+MINERU_INLINE_CONTENT_LIST_MAX_BYTES = int(os.getenv('MINERU_INLINE_CONTENT_LIST_MAX_BYTES', 256 * 1024))
+
 # Pagination configuration is read directly from environment variables when needed
 # No need to pre-load constants as they may change between tasks
 
 # Supported file formats
 PDF_IMAGE_FORMATS = {'.pdf', '.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif', '.webp'}
+_PDF_IMAGE_SUFFIXES = tuple(PDF_IMAGE_FORMATS)
+
+# Markdown image link: ![alt](path)
+IMAGE_LINK_PATTERN = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+
+# Keys that may carry a page number in content_list items, in lookup order
+CONTENT_LIST_PAGE_KEYS = ('page_idx', 'page_no', 'page_number', 'page', 'page_index', 'page_num')
+
+# Linearization dictionary, required to be within the first 1024 bytes of a linearized PDF
+PDF_LINEARIZED_DICT_PATTERN = re.compile(rb'<<[^>]*/Linearized\b[^>]*>>')
 
 # MIME type mapping
 MIME_TYPE_MAP = {
@@ -108,30 +155,110 @@ MIME_TYPE_MAP = {
     '.bmp': 'image/bmp',
     '.webp': 'image/webp',
     '.tiff': 'image/tiff',
-    '.tif': 'image/tiff'
+    '.tif': 'image/tiff',
+    '.svg': 'image/svg+xml'
 }
 
 # MinIO configuration
 MINIO_CONFIG = {
-    'endpoint': os.getenv('MINIO_ENDPOINT', 'localhost:9000'),
-    'access_key': os.getenv('MINIO_ACCESS_KEY', 'minioadmin'),
-    'secret_key': os.getenv('MINIO_SECRET_KEY', 'minioadmin'),
+    'endpoint': os.getenv('MINIO_ENDPOINT', ''),
+    'access_key': os.getenv('MINIO_ACCESS_KEY', ''),
+    'secret_key': os.getenv('MINIO_SECRET_KEY', ''),
     'secure': os.getenv('MINIO_SECURE', 'false').lower() == 'true',
-    'bucket_name': os.getenv('MINIO_BUCKET', 'documents')
+    'bucket_name': os.getenv('MINIO_BUCKET', '')
 }
 
 
+# Global MinIO client instance (thread-safe, reuses its connection pool across tasks)
+_minio_client = None
+_minio_client_lock = threading.Lock()
+
+
 def get_minio_client():
-    """Get MinIO client"""
-    if not MINIO_AVAILABLE or not all(MINIO_CONFIG.values()):
+    """Get MinIO client (singleton, None if MinIO is not installed or not configured)"""
+    global _minio_client
+    required = ('endpoint', 'access_key', 'secret_key', 'bucket_name')
+    if not MINIO_AVAILABLE or not all(MINIO_CONFIG[key] for key in required):
         return None
     
-    return Minio(
-        MINIO_CONFIG['endpoint'],
-        access_key=MINIO_CONFIG['access_key'],
-        secret_key=MINIO_CONFIG['secret_key'],
-        secure=MINIO_CONFIG['secure']
-    )
+    if _minio_client is None:
+        with _minio_client_lock:
+            if _minio_client is None:
+                _minio_client = Minio(
+                    MINIO_CONFIG['endpoint'],
+                    access_key=MINIO_CONFIG['access_key'],
+                    secret_key=MINIO_CONFIG['secret_key'],
+                    secure=MINIO_CONFIG['secure']
+                )
+    return _minio_client
+
+
+def _reclaim_memory() -> None:
+    """Run a full GC pass and return freed heap pages to the OS (glibc only)"""
+    gc.collect()
+    if _malloc_trim is not None:
+        try:
+            _malloc_trim(0)
+        except Exception:
+            pass
+
+
+# Models loaded before the worker starts consuming tasks (see preload_models)
+_preloaded_models: List[Any] = []
+
+
+def preload_models() -> None:
+    """
+    Load MinerU pipeline models before the worker starts consuming tasks
+
+    Called before celery_app.worker_main to warm MinerU's model cache, so the
+    threads pool (required by MinerU) does not load the models on its first task.
+    Controlled by MINERU_PRELOAD_MODELS (default: true).
+    """
+    if os.getenv('MINERU_PRELOAD_MODELS', 'true').lower() != 'true':
+        return
+    if not MINERU_AVAILABLE:
+        logger.warning("MinerU not available, skipping model preload")
+        return
+
+    # CUDA/NPU contexts do not survive fork(), only preload for non-forking pools on accelerators
+    worker_pool = celeryconfig.WORKER_POOL or 'prefork'
+    device = get_device()
+    if worker_pool == 'prefork' and not device.startswith(('cpu', 'mps')):
+        logger.warning(f"Skipping model preload: prefork pool cannot share {device} models across fork()")
+        return
+
+    try:
+        from mineru.backend.pipeline.pipeline_analyze import ModelSingleton
+        # Same cache key as the pipeline's BatchAnalyze, which always asks for lang=None
+        # (OCR language models are loaded separately); any other lang loads a second copy
+        model = ModelSingleton().get_model(
+            lang=None,
+            formula_enable=MINERU_FORMULA_ENABLE,
+            table_enable=MINERU_TABLE_ENABLE,
+        )
+        _preloaded_models.append(model)
+        logger.info(f"✅ Preloaded MinerU pipeline models on {device}")
+    except Exception as e:
+        logger.warning(f"Failed to preload MinerU models, they will be loaded on first task: {e}")
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0))
+        except TypeError:
+            # Values orjson rejects (e.g. integers beyond 64 bits) go through stdlib json
+            pass
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data: Any) -> Any:
+    """Deserialize JSON from bytes or str, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def get_file_type(file_path: str) -> str:
@@ -142,36 +269,91 @@ def get_file_type(file_path: str) -> str:
         'pdf_image': PDF or image format, use MinerU parsing
         'markitdown': All other formats, use markitdown parsing
     """
-    suffix = Path(file_path).suffix.lower()
-    
-    if suffix in PDF_IMAGE_FORMATS:
+    if file_path.lower().endswith(_PDF_IMAGE_SUFFIXES):
         return 'pdf_image'
     else:
         return 'markitdown'
 
 
-def get_pdf_page_count(file_path: Path) -> int:
+def open_pdf_document(file_path: Path):
     """
-    Get the total number of pages in a PDF file
+    Open a PDF file with pypdfium2 and get its page count
+    
+    The returned document can be handed to split_pdf_file so the file is
+    only parsed once; otherwise release it with close_pdf_document.
     
     Args:
         file_path: Path to PDF file
         
     Returns:
-        Total number of pages, or 0 if unable to determine
+        (PdfDocument, page count), or (None, 0) if unable to open the file
     """
     if not PYPDFIUM2_AVAILABLE:
         logger.warning("pypdfium2 not available, cannot detect PDF page count")
-        return 0
+        return None, 0
     
     try:
         with pypdfium2_lock:
             pdf = pypdfium2.PdfDocument(file_path)
-            page_count = len(pdf)
-            pdf.close()
-            return page_count
+            try:
+                return pdf, len(pdf)
+            except Exception:
+                pdf.close()
+                raise
     except Exception as e:
         logger.error(f"Failed to get PDF page count for {file_path}: {e}")
+        return None, 0
+
+
+def close_pdf_document(pdf) -> None:
+    """Close a document returned by open_pdf_document (None is ignored)"""
+    if pdf is None:
+        return
+    try:
+        with pypdfium2_lock:
+            pdf.close()
+    except Exception as e:
+        logger.warning(f"Failed to close PDF document: {e}")
+
+
+def get_pdf_page_count_remote(storage_path: str) -> int:
+    """
+    Get the page count of a PDF in storage without downloading the whole file
+    
+    Reads only the first 1KB and takes the page count (/N) from the
+    linearization dictionary. Linearized ("fast web view") PDFs carry it
+    there; the dictionary is ignored if its recorded length (/L) does not
+    match the file size (the PDF was updated after linearization).
+    Controlled by MINERU_REMOTE_PAGECOUNT (default: true).
+    
+    Args:
+        storage_path: Storage path of the PDF file
+        
+    Returns:
+        Total number of pages, or 0 if it cannot be determined this way
+        (caller falls back to downloading the file)
+    """
+    if os.getenv('MINERU_REMOTE_PAGECOUNT', 'true').lower() != 'true':
+        return 0
+    
+    try:
+        storage = get_storage()
+        head = storage.read_range(storage_path, 0, 1024)
+        match = PDF_LINEARIZED_DICT_PATTERN.search(head)
+        if not match:
+            return 0
+        
+        linearized = match.group(0)
+        page_count = re.search(rb'/N\s+(\d+)', linearized)
+        file_length = re.search(rb'/L\s+(\d+)', linearized)
+        if not page_count or not file_length:
+            return 0
+        if int(file_length.group(1)) != storage.get_file_size(storage_path):
+            return 0
+        
+        return int(page_count.group(1))
+    except Exception as e:
+        logger.debug(f"Could not read remote page count for {storage_path}: {e}")
         return 0
 
 
@@ -179,7 +361,8 @@ def split_pdf_file(
     pdf_path: Path, 
     output_dir: Path, 
     chunk_size: int = 500, 
-    parent_task_id: str = None
+    parent_task_id: str = None,
+    source_pdf=None
 ) -> List[Dict[str, Any]]:
     """
     Split PDF file into multiple chunks using pypdfium2
@@ -189,6 +372,8 @@ def split_pdf_file(
         output_dir: Output directory for chunk files
         chunk_size: Number of pages per chunk
         parent_task_id: Parent task ID (for generating filenames)
+        source_pdf: Already opened document for pdf_path (from open_pdf_document);
+            split_pdf_file takes ownership and closes it once splitting is done
         
     Returns:
         List of chunk info dicts, each containing:
@@ -200,6 +385,7 @@ def split_pdf_file(
     if not PYPDFIUM2_AVAILABLE:
         raise RuntimeError("pypdfium2 is required for PDF splitting. Install with: pip install pypdfium2")
     
+    pdf = source_pdf
     try:
         chunks = []
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -207,67 +393,67 @@ def split_pdf_file(
         
         # Open PDF and get page count (within lock for thread safety)
         with pypdfium2_lock:
-            pdf = pypdfium2.PdfDocument(pdf_path)
+            if pdf is None:
+                pdf = pypdfium2.PdfDocument(pdf_path)
             total_pages = len(pdf)
         
         logger.info(f"✂️  Splitting PDF: {pdf_path.name} ({total_pages} pages)")
         logger.info(f"   Chunk size: {chunk_size} pages")
         logger.info("   Using pypdfium2 for PDF splitting")
         
-        import tempfile
-        import io
+        # pdfium work stays serialized (see below), but uploads run on a thread pool so
+        # storage I/O overlaps with building the next chunk
+        split_workers = max(1, int(os.getenv('MINERU_SPLIT_WORKERS', 4)))
+        uploads = []
         
-        for i in range(0, total_pages, chunk_size):
-            end_page = min(i + chunk_size, total_pages)
-            chunk_page_count = end_page - i
-            
-            # Generate chunk filename
-            if parent_task_id:
-                chunk_filename = f"{parent_task_id}_chunk_{i+1}_{end_page}.pdf"
-            else:
-                chunk_filename = f"{pdf_path.stem}_chunk_{i+1}_{end_page}.pdf"
-            
-            # Create chunk PDF and save to bytes (within lock for thread safety)
-            with pypdfium2_lock:
-                chunk_pdf = pypdfium2.PdfDocument.new()
-                page_indices = list(range(i, end_page))
-                chunk_pdf.import_pages(pdf, pages=page_indices)
-                
-                # Save to bytes buffer
-                pdf_buffer = io.BytesIO()
-                chunk_pdf.save(pdf_buffer)
-                pdf_bytes = pdf_buffer.getvalue()
-                pdf_buffer.close()
-                chunk_pdf.close()
-            
-            # File I/O operations outside lock (no pypdfium2 operations)
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_chunk:
-                tmp_chunk.write(pdf_bytes)
-                chunk_local_path = Path(tmp_chunk.name)
-            
-            # Upload chunk to storage
-            chunk_storage_key = f"splits/{parent_task_id}/{chunk_filename}" if parent_task_id else f"splits/{chunk_filename}"
-            chunk_storage_path = storage.save_temp_file(chunk_storage_key, chunk_local_path.read_bytes())
-            
-            # Clean up local temporary file
-            try:
-                chunk_local_path.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to cleanup temp chunk file: {e}")
-            
+        try:
+            with ThreadPoolExecutor(max_workers=split_workers) as executor:
+                for i in range(0, total_pages, chunk_size):
+                    end_page = min(i + chunk_size, total_pages)
+                    
+                    # Generate chunk filename
+                    if parent_task_id:
+                        chunk_filename = f"{parent_task_id}_chunk_{i+1}_{end_page}.pdf"
+                    else:
+                        chunk_filename = f"{pdf_path.stem}_chunk_{i+1}_{end_page}.pdf"
+                    
+                    page_indices = list(range(i, end_page))
+                    chunk_local_path = output_dir / chunk_filename
+                    
+                    # Create chunk PDF and save to disk. Only the pdfium calls are under the lock:
+                    # pdfium keeps library-wide state, so even separate documents cannot be
+                    # processed concurrently, but nothing else here needs serializing.
+                    with pypdfium2_lock:
+                        chunk_pdf = pypdfium2.PdfDocument.new()
+                        try:
+                            chunk_pdf.import_pages(pdf, pages=page_indices)
+                            chunk_pdf.save(str(chunk_local_path))
+                        finally:
+                            chunk_pdf.close()
+                    
+                    # Bound the number of local chunk files waiting for upload
+                    if len(uploads) >= split_workers:
+                        uploads[-split_workers][1].result()
+                    
+                    # Move chunk into storage (outside lock): a rename for local storage, a streamed upload for S3
+                    chunk_storage_key = f"splits/{parent_task_id}/{chunk_filename}" if parent_task_id else f"splits/{chunk_filename}"
+                    uploads.append(((i + 1, end_page), executor.submit(storage.save_temp_file_from_path, chunk_storage_key, chunk_local_path)))
+        finally:
+            # Close PDF once all pages are copied, before waiting on the remaining uploads
+            close_pdf_document(pdf)
+            pdf = None
+        
+        for (chunk_start_page, chunk_end_page), upload in uploads:
+            chunk_page_count = chunk_end_page - chunk_start_page + 1
             chunk_info = {
-                "path": chunk_storage_path,  # Storage path
-                "start_page": i + 1,  # 1-based
-                "end_page": end_page,  # 1-based
+                "path": upload.result(),  # Storage path
+                "start_page": chunk_start_page,  # 1-based
+                "end_page": chunk_end_page,  # 1-based
                 "page_count": chunk_page_count,
             }
             chunks.append(chunk_info)
             
-            logger.info(f"   ✅ Created chunk {len(chunks)}: pages {i+1}-{end_page} ({chunk_page_count} pages)")
-        
-        # Close PDF (within lock for thread safety)
-        with pypdfium2_lock:
-            pdf.close()
+            logger.info(f"   ✅ Created chunk {len(chunks)}: pages {chunk_start_page}-{chunk_end_page} ({chunk_page_count} pages)")
         
         logger.info(f"✅ Split into {len(chunks)} chunks")
         return chunks
@@ -278,131 +464,246 @@ def split_pdf_file(
     except Exception as e:
         logger.error(f"❌ Failed to split PDF: {e}")
         raise
+    finally:
+        # Only still open if splitting failed before the pages were copied
+        close_pdf_document(pdf)
 
 
-def process_markdown_images_base64(md_content: str, image_dir: Path) -> str:
-    """Convert images in Markdown to base64 format"""
-    logger.info(f"🔄 Converting images to base64: image_dir={image_dir}")
+def _iter_files(root: str):
+    """Yield a DirEntry for every regular file under root (file types come from the directory listing)"""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def upload_output_dir(output_path: Path, output_key_prefix: str) -> None:
+    """
+    Upload every file under output_path to output storage, keyed by its relative path
     
-    if not image_dir.exists():
-        logger.warning(f"Image directory does not exist for base64 conversion: {image_dir}")
-        return md_content
+    Files are streamed from disk. With S3 storage the uploads run on a thread pool
+    (MINERU_S3_UPLOAD_WORKERS threads) so per-request latency overlaps; local storage
+    copies them one by one.
+    """
+    storage = get_storage()
+    root = str(output_path)
+    files = [(f"{output_key_prefix}{os.path.relpath(entry.path, root)}", entry.path)
+             for entry in _iter_files(root)]
     
-    import re
-    import base64
-    import mimetypes
+    def _upload(item) -> None:
+        storage_key, path = item
+        # Stream from disk instead of loading the whole file into memory
+        with open(path, 'rb') as fh:
+            storage.save_output_file(storage_key, fh)
+        logger.debug(f"Uploaded output file: {storage_key}")
     
+    upload_workers = max(1, int(os.getenv('MINERU_S3_UPLOAD_WORKERS', 8)))
+    if storage.storage_type != 's3' or upload_workers == 1 or len(files) <= 1:
+        for item in files:
+            _upload(item)
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(upload_workers, len(files))) as executor:
+        # list() re-raises the first failed upload, like the sequential loop
+        list(executor.map(_upload, files))
+
+
+def _resolve_image_path(image_dir: Path, image_path: str) -> Path:
+    """Resolve a Markdown image link (e.g. images/xxx.jpg) to a file in image_dir"""
+    # If image_path starts with images/, remove this prefix
+    if image_path.startswith('images/'):
+        image_path = image_path[7:]  # Remove 'images/' prefix
+    return image_dir / image_path
+
+
+def _replace_image_links(md_content: str, convert: Callable[[str], Optional[str]]) -> Tuple[str, bool]:
+    """
+    Replace the target of every Markdown image link in a single pass
+    
+    Args:
+        md_content: Markdown content
+        convert: Maps an image path to its new link target, or None to keep the link
+        
+    Returns:
+        (updated Markdown content, whether any link was replaced)
+        
+    Each distinct image path is converted once, in parallel on a thread pool
+    (MINERU_IMAGE_WORKERS threads), so file and network I/O overlap.
+    """
     # Find all image links
-    image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    matches = re.findall(image_pattern, md_content)
+    image_paths = list(dict.fromkeys(image_path for _, image_path in IMAGE_LINK_PATTERN.findall(md_content)))
     
-    if not matches:
-        return md_content
+    if not image_paths:
+        return md_content, False
     
-    # MIME type mapping uses global constant
-    mime_map = MIME_TYPE_MAP
+    image_workers = max(1, min(int(os.getenv('MINERU_IMAGE_WORKERS', 8)), len(image_paths)))
+    with ThreadPoolExecutor(max_workers=image_workers) as executor:
+        targets = dict(zip(image_paths, executor.map(convert, image_paths)))
     
-    # Replace image links with base64
-    for alt_text, image_path in matches:
-        # Build full image path
-        # If image_path starts with images/, remove this prefix
-        if image_path.startswith('images/'):
-            image_filename = image_path[7:]  # Remove 'images/' prefix
-        else:
-            image_filename = image_path
+    def _replace_link(match: re.Match) -> str:
+        target = targets.get(match.group(2))
+        if target is None:
+            return match.group(0)
+        return f"![{match.group(1)}]({target})"
+    
+    if all(target is None for target in targets.values()):
+        return md_content, False
+    return IMAGE_LINK_PATTERN.sub(_replace_link, md_content), True
+
+
+def _encode_image_entry(img_path: Path) -> Optional[Dict[str, Any]]:
+    """Read one image and build its images list entry (None if it cannot be read)"""
+    try:
+        img_data = img_path.read_bytes()
+        # MinerU only writes a few image formats, all in MIME_TYPE_MAP; mimetypes is the fallback
+        mime_type = MIME_TYPE_MAP.get(img_path.suffix.lower())
+        if mime_type is None:
+            import mimetypes
+            mime_type, _ = mimetypes.guess_type(img_path.name)
+            if not mime_type or not mime_type.startswith('image/'):
+                mime_type = 'image/png'
+        data_url = f"data:{mime_type};base64,{base64.b64encode(img_data).decode('ascii')}"
+        return {
+            'filename': img_path.name,
+            'mime_type': mime_type,
+            'size_bytes': len(img_data),
+            'data_url': data_url,
+        }
+    except Exception as e:
+        logger.warning(f"Failed to build base64 for image {img_path}: {e}")
+        return None
+
+
+def build_images_list(image_dir: Path) -> List[Dict[str, Any]]:
+    """
+    Build the base64 images list returned with a parse result
+    
+    Images are read and encoded on a thread pool (MINERU_IMAGE_WORKERS threads);
+    the list keeps filename order.
+    """
+    with os.scandir(image_dir) as entries:
+        img_paths = sorted(Path(entry.path) for entry in entries if entry.is_file())
+    if not img_paths:
+        return []
+    
+    image_workers = max(1, min(int(os.getenv('MINERU_IMAGE_WORKERS', 8)), len(img_paths)))
+    with ThreadPoolExecutor(max_workers=image_workers) as executor:
+        return [entry for entry in executor.map(_encode_image_entry, img_paths) if entry is not None]
+
+
+def _image_data_url(full_image_path: Path) -> Optional[str]:
+    """Read an image file and return it as a base64 data URL (None if it cannot be read)"""
+    try:
+        # Read image file
+        img_data = full_image_path.read_bytes()
         
-        full_image_path = image_dir / image_filename
+        # Get MIME type from file extension
+        mime_type = MIME_TYPE_MAP.get(full_image_path.suffix.lower(), 'image/png')
         
-        if full_image_path.exists():
-            try:
-                # Read image file
-                with open(full_image_path, 'rb') as img_file:
-                    img_data = img_file.read()
-                
-                # Get MIME type
-                mime_type, _ = mimetypes.guess_type(str(full_image_path))
-                if not mime_type or not mime_type.startswith('image/'):
-                    # Set default MIME type based on file extension
-                    ext = full_image_path.suffix.lower()
-                    mime_type = mime_map.get(ext, 'image/png')
-                
-                # Convert to base64
-                img_base64 = base64.b64encode(img_data).decode('utf-8')
-                
-                # Create data URL
-                data_url = f"data:{mime_type};base64,{img_base64}"
-                
-                # Replace link in Markdown
-                old_link = f"![{alt_text}]({image_path})"
-                new_link = f"![{alt_text}]({data_url})"
-                md_content = md_content.replace(old_link, new_link)
-                
-                logger.info(f"Converted image to base64: {image_path} ({len(img_data)} bytes)")
-                
-            except Exception as e:
-                logger.error(f"Failed to convert image to base64 {image_path}: {e}")
+        # Convert to base64
+        img_base64 = base64.b64encode(img_data).decode('ascii')
+        
+        logger.info(f"Converted image to base64: {full_image_path.name} ({len(img_data)} bytes)")
+        
+        # Create data URL
+        return f"data:{mime_type};base64,{img_base64}"
+        
+    except Exception as e:
+        logger.error(f"Failed to convert image to base64 {full_image_path}: {e}")
+        return None
+
+
+def process_markdown_images_base64(md_content: str, image_dir: Path) -> Tuple[str, bool]:
+    """
+    Convert images in Markdown to base64 format
     
-    return md_content
+    Returns:
+        (updated Markdown content, whether any image was inlined as base64)
+    """
+    logger.info(f"🔄 Converting images to base64: image_dir={image_dir}")
+    
+    if not image_dir.exists():
+        logger.warning(f"Image directory does not exist for base64 conversion: {image_dir}")
+        return md_content, False
+    
+    def _to_data_url(image_path: str) -> Optional[str]:
+        full_image_path = _resolve_image_path(image_dir, image_path)
+        
+        if not full_image_path.exists():
+            return None
+        
+        return _image_data_url(full_image_path)
+    
+    return _replace_image_links(md_content, _to_data_url)
 
 
-def process_markdown_images(md_content: str, image_dir: Path, upload_images: bool = False) -> str:
-    """Process image links in Markdown"""
+def process_markdown_images(md_content: str, image_dir: Path, upload_images: bool = False) -> Tuple[str, bool, bool]:
+    """
+    Process image links in Markdown
+    
+    Returns:
+        (updated Markdown content, whether any image was inlined as base64,
+        whether any image was uploaded to MinIO)
+    """
     logger.info(f"🖼️ Processing images: upload_images={upload_images}, image_dir={image_dir}")
     
     if not image_dir.exists():
         logger.warning(f"Image directory does not exist: {image_dir}")
-        return md_content
+        return md_content, False, False
     
     if upload_images:
-        # Original logic for uploading to MinIO
-        import re
-        
-        # Find all image links
-        image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-        matches = re.findall(image_pattern, md_content)
-        
-        if not matches:
-            return md_content
-        
+        # Upload to MinIO and link to the uploaded objects
         minio_client = get_minio_client()
         if not minio_client:
             logger.warning("MinIO not configured, skipping image upload")
-            return md_content
+            return md_content, False, False
         
-        # Replace image links
-        for alt_text, image_path in matches:
-            # Build full image path
-            full_image_path = image_dir / image_path
+        scheme = 'https' if MINIO_CONFIG['secure'] else 'http'
+        # Appended to from worker threads: images that fell back to an inline data URL,
+        # and images that were uploaded
+        inlined = []
+        uploaded = []
+        
+        def _upload(image_path: str) -> Optional[str]:
+            full_image_path = _resolve_image_path(image_dir, image_path)
             
-            if full_image_path.exists():
-                try:
-                    # Generate unique object name
-                    object_name = f"mineru/{uuid.uuid4()}/{full_image_path.name}"
-                    
-                    # Upload to MinIO
-                    minio_client.fput_object(
-                        MINIO_CONFIG['bucket_name'],
-                        object_name,
-                        str(full_image_path)
-                    )
-                    
-                    # Generate access URL
-                    image_url = f"https://{MINIO_CONFIG['endpoint']}/{MINIO_CONFIG['bucket_name']}/{object_name}"
-                    
-                    # Replace link in Markdown
-                    old_link = f"![{alt_text}]({image_path})"
-                    new_link = f"![{alt_text}]({image_url})"
-                    md_content = md_content.replace(old_link, new_link)
-                    
-                    logger.info(f"Uploaded image: {image_path} -> {image_url}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to upload image {image_path}: {e}")
-    else:
-        # Default: convert to base64 format
-        md_content = process_markdown_images_base64(md_content, image_dir)
+            if not full_image_path.exists():
+                return None
+            
+            try:
+                # Generate unique object name
+                object_name = f"mineru/{uuid.uuid4()}/{full_image_path.name}"
+                
+                # Upload to MinIO
+                minio_client.fput_object(
+                    MINIO_CONFIG['bucket_name'],
+                    object_name,
+                    str(full_image_path)
+                )
+                
+                # Generate access URL
+                image_url = f"{scheme}://{MINIO_CONFIG['endpoint']}/{MINIO_CONFIG['bucket_name']}/{object_name}"
+                
+                logger.info(f"Uploaded image: {image_path} -> {image_url}")
+                uploaded.append(image_path)
+                return image_url
+                
+            except Exception as e:
+                # Inline the image instead, a relative path would not resolve for the client
+                logger.error(f"Failed to upload image {image_path}, embedding it as base64: {e}")
+                data_url = _image_data_url(full_image_path)
+                if data_url is not None:
+                    inlined.append(image_path)
+                return data_url
+        
+        md_content, _ = _replace_image_links(md_content, _upload)
+        return md_content, bool(inlined), bool(uploaded)
     
-    return md_content
+    # Default: convert to base64 format
+    md_content, has_base64_images = process_markdown_images_base64(md_content, image_dir)
+    return md_content, has_base64_images, False
 
 
 @celery_app.task(
@@ -437,24 +738,25 @@ def parse_document_task(
     task_id = self.request.id
     storage = get_storage()
     
-    # Download file to check if splitting is needed
-    local_file = storage.download_to_local(file_path)
-    local_input_path = Path(local_file)
+    # Local copy of the input, only downloaded when the full PDF is needed here
+    # (page counting or splitting); direct parsing downloads it on its own
+    local_input_path: Optional[Path] = None
+    # Document opened for page counting, kept open so splitting does not parse the file again
+    source_pdf = None
     
     try:
-        if not local_input_path.exists():
+        if storage.storage_type == 'local' and not Path(file_path).exists():
             import time
             wait_seconds = float(os.getenv('MINERU_WAIT_FOR_INPUT_SECONDS', '5'))
             deadline = time.time() + wait_seconds
-            while not local_input_path.exists() and time.time() < deadline:
+            while not Path(file_path).exists() and time.time() < deadline:
                 time.sleep(0.2)
-            if not local_input_path.exists():
+            if not Path(file_path).exists():
                 return {
                     'status': 'failed',
                     'file_name': file_name,
                     'backend': backend,
-                    'error_message': f'Input file not found: {local_input_path}',
-                    'traceback': '',
+                    'error_message': f'Input file not found: {file_path}',
                     'completed_at': datetime.now().isoformat()
                 }
 
@@ -471,15 +773,27 @@ def parse_document_task(
         # Only check if pagination is not explicitly disabled and globally enabled
         if not user_disable_pagination and pagination_enabled:
             if PYPDFIUM2_AVAILABLE and file_name.lower().endswith('.pdf'):
-                total_pages = get_pdf_page_count(local_input_path)
+                # Try to read the page count without downloading the whole PDF first
+                if storage.storage_type == 's3':
+                    total_pages = get_pdf_page_count_remote(file_path)
+                if not total_pages:
+                    local_input_path = Path(storage.download_to_local(file_path))
+                    source_pdf, total_pages = open_pdf_document(local_input_path)
                 pagination_threshold = int(os.getenv('MINERU_PAGINATION_THRESHOLD', 100))
                 
                 if total_pages > pagination_threshold:
                     use_pagination = True
                     logger.info(f"🔀 Large PDF detected ({total_pages} pages), will split and parse in chunks")
+                else:
+                    close_pdf_document(source_pdf)
+                    source_pdf = None
         
         if use_pagination:
-            # Split and parse in chunks
+            if local_input_path is None:
+                local_input_path = Path(storage.download_to_local(file_path))
+            
+            # Split and parse in chunks; the opened document is handed over to the split
+            pdf_to_split, source_pdf = source_pdf, None
             return _handle_split_and_parse(
                 self,
                 local_input_path,
@@ -488,7 +802,8 @@ def parse_document_task(
                 backend,
                 options,
                 upload_images,
-                task_id
+                task_id,
+                source_pdf=pdf_to_split
             )
         else:
             # Parse directly (no splitting needed)
@@ -513,12 +828,31 @@ def parse_document_task(
                 upload_images=upload_images
             )
     finally:
+        close_pdf_document(source_pdf)
+        
         # Clean up local file
         try:
-            if local_input_path.exists() and str(local_input_path) != file_path:
+            if local_input_path is not None and local_input_path.exists() and str(local_input_path) != file_path:
                 local_input_path.unlink()
         except Exception as e:
             logger.warning(f"Failed to cleanup local temp file: {e}")
+        
+        # Long-lived workers otherwise keep the peak heap of the largest document
+        _reclaim_memory()
+
+
+def _build_chunk_options(options: Dict[str, Any], chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy parse options for a chunk and attach its page range as chunk_info"""
+    chunk_start_page = chunk.get('start_page', 1)
+    chunk_end_page = chunk.get('end_page', 1)
+    
+    chunk_options = options.copy()
+    chunk_options['chunk_info'] = {
+        'start_page': chunk_start_page,
+        'end_page': chunk_end_page,
+        'page_count': chunk.get('page_count', chunk_end_page - chunk_start_page + 1),
+    }
+    return chunk_options
 
 
 def _handle_split_and_parse(
@@ -529,117 +863,157 @@ def _handle_split_and_parse(
     backend: str,
     options: Dict[str, Any],
     upload_images: bool,
-    parent_task_id: str
+    parent_task_id: str,
+    source_pdf=None
 ) -> Dict[str, Any]:
     """Handle splitting, parsing chunks, and merging results"""
-    storage = get_storage()
     chunk_size = int(os.getenv('MINERU_PAGE_CHUNK_SIZE', 50))
     
-    # Create splits directory
-    import tempfile
-    splits_dir = Path(tempfile.gettempdir()) / "mineru_splits" / parent_task_id
-    splits_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Split PDF
-    chunks = split_pdf_file(
-        pdf_path=local_input_path,
-        output_dir=splits_dir,
-        chunk_size=chunk_size,
-        parent_task_id=parent_task_id
-    )
+    try:
+        # Create splits directory
+        import tempfile
+        splits_dir = Path(tempfile.gettempdir()) / "mineru_splits" / parent_task_id
+        splits_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Split PDF; split_pdf_file takes ownership of the opened document
+        pdf_to_split, source_pdf = source_pdf, None
+        chunks = split_pdf_file(
+            pdf_path=local_input_path,
+            output_dir=splits_dir,
+            chunk_size=chunk_size,
+            parent_task_id=parent_task_id,
+            source_pdf=pdf_to_split
+        )
+    finally:
+        # Only still open if this failed before handing it to split_pdf_file
+        close_pdf_document(source_pdf)
     logger.info(f"✂️  PDF split into {len(chunks)} chunks")
 
-    if storage.storage_type == 'local':
-        self.update_state(
-            state=states.STARTED,
-            meta={
-                'status': 'splitting_and_parsing',
-                'file_name': file_name,
-                'backend': backend,
-                'chunk_count': len(chunks),
-                'started_at': datetime.now().isoformat()
-            }
+    if get_storage().storage_type == 'local':
+        # Parse chunks inside this task, no broker/result backend round-trips needed
+        return _parse_chunks_locally(
+            self, chunks, storage_file_path, file_name, backend, options, upload_images, parent_task_id
         )
 
-        chunk_results: List[Dict[str, Any]] = []
-        failed_chunks: List[Dict[str, Any]] = []
+    return _submit_chunks_async(
+        self, chunks, storage_file_path, file_name, backend, options, upload_images
+    )
 
-        for chunk in chunks:
-            chunk_file_path = chunk['path']
-            chunk_start_page = chunk.get('start_page', 1)
-            chunk_end_page = chunk.get('end_page', 1)
 
-            chunk_options = options.copy()
-            chunk_options['chunk_info'] = {
-                'start_page': chunk_start_page,
-                'end_page': chunk_end_page,
-                'page_count': chunk.get('page_count', chunk_end_page - chunk_start_page + 1),
-            }
+def _parse_chunks_locally(
+    self,
+    chunks: List[Dict[str, Any]],
+    storage_file_path: str,
+    file_name: str,
+    backend: str,
+    options: Dict[str, Any],
+    upload_images: bool,
+    parent_task_id: str
+) -> Dict[str, Any]:
+    """
+    Parse chunks synchronously in the current task and merge the results
+    
+    Chunks are parsed one at a time by default: MinerU parsing holds pypdfium2_lock
+    and the models' device memory, so extra threads mostly wait. Set
+    MINERU_LOCAL_CHUNK_WORKERS > 1 to parse chunks on a thread pool.
+    """
+    storage = get_storage()
+    self.update_state(
+        state=states.STARTED,
+        meta={
+            'status': 'splitting_and_parsing',
+            'file_name': file_name,
+            'backend': backend,
+            'chunk_count': len(chunks),
+            'started_at': datetime.now().isoformat()
+        }
+    )
 
-            chunk_task_id = f"{parent_task_id}_{chunk_start_page}_{chunk_end_page}_{uuid.uuid4().hex[:8]}"
-            chunk_result = _execute_parse_document(
-                file_path=chunk_file_path,
-                file_name=f"{Path(file_name).stem}_pages_{chunk_start_page}-{chunk_end_page}.pdf",
-                task_id=chunk_task_id,
-                backend=backend,
-                options=chunk_options,
-                upload_images=upload_images,
-            )
+    base_name = Path(file_name).stem
+    
+    def _parse_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        chunk_start_page = chunk.get('start_page', 1)
+        chunk_end_page = chunk.get('end_page', 1)
+        chunk_task_id = f"{parent_task_id}_{chunk_start_page}_{chunk_end_page}_{uuid.uuid4().hex[:8]}"
+        return _execute_parse_document(
+            file_path=chunk['path'],
+            file_name=f"{base_name}_pages_{chunk_start_page}-{chunk_end_page}.pdf",
+            task_id=chunk_task_id,
+            backend=backend,
+            options=_build_chunk_options(options, chunk),
+            upload_images=upload_images,
+        )
 
-            if chunk_result.get('status') == 'failed':
-                failed_chunks.append({
-                    'file_name': chunk_result.get('file_name'),
-                    'start_page': chunk_start_page,
-                    'end_page': chunk_end_page,
-                    'error': chunk_result.get('error_message', 'Unknown error'),
-                })
-                continue
+    local_chunk_workers = max(1, min(int(os.getenv('MINERU_LOCAL_CHUNK_WORKERS', 1)), len(chunks)))
+    if local_chunk_workers > 1:
+        with ThreadPoolExecutor(max_workers=local_chunk_workers) as executor:
+            parsed_chunks = list(executor.map(_parse_chunk, chunks))
+    else:
+        parsed_chunks = [_parse_chunk(chunk) for chunk in chunks]
 
-            chunk_result['start_page'] = chunk_start_page
-            chunk_result['end_page'] = chunk_end_page
-            chunk_results.append(chunk_result)
+    chunk_results: List[Dict[str, Any]] = []
+    first_error = None
 
-        try:
-            storage.delete_file(storage_file_path)
-        except Exception as e:
-            logger.warning(f"Failed to cleanup storage temp file {storage_file_path}: {e}")
+    for chunk, chunk_result in zip(chunks, parsed_chunks):
+        chunk_start_page = chunk.get('start_page', 1)
+        chunk_end_page = chunk.get('end_page', 1)
 
-        if not chunk_results:
-            first_error = failed_chunks[0]['error'] if failed_chunks else 'Unknown'
-            return {
-                'status': 'failed',
-                'file_name': file_name,
-                'backend': backend,
-                'error_message': f"All {len(chunks)} chunks failed. First error: {first_error}",
-                'completed_at': datetime.now().isoformat()
-            }
+        if chunk_result.get('status') == 'failed':
+            first_error = first_error or chunk_result.get('error_message', 'Unknown error')
+            continue
 
-        return _merge_chunk_results_from_results(
-            chunk_results=chunk_results,
-            file_name=file_name,
-            backend=backend,
-            task_id=parent_task_id,
-        )
+        chunk_result['start_page'] = chunk_start_page
+        chunk_result['end_page'] = chunk_end_page
+        chunk_results.append(chunk_result)
+
+    try:
+        storage.delete_file(storage_file_path)
+    except Exception as e:
+        logger.warning(f"Failed to cleanup storage temp file {storage_file_path}: {e}")
+
+    if not chunk_results:
+        return {
+            'status': 'failed',
+            'file_name': file_name,
+            'backend': backend,
+            'error_message': f"All {len(chunks)} chunks failed. First error: {first_error or 'Unknown'}",
+            'completed_at': datetime.now().isoformat()
+        }
+
+    return _merge_chunk_results_from_results(
+        chunk_results=chunk_results,
+        file_name=file_name,
+        backend=backend,
+        task_id=parent_task_id,
+    )
+
+
+def _submit_chunks_async(
+    self,
+    chunks: List[Dict[str, Any]],
+    storage_file_path: str,
+    file_name: str,
+    backend: str,
+    options: Dict[str, Any],
+    upload_images: bool
+) -> Dict[str, Any]:
+    """Submit chunk parse tasks plus a merge task to the queue and wait for the merged result"""
+    storage = get_storage()
     
     # Submit parse tasks for each chunk
     chunk_task_ids = []
+    base_name = Path(file_name).stem
     for chunk in chunks:
         chunk_file_path = chunk['path']  # Storage path
         chunk_start_page = chunk.get('start_page', 1)
         chunk_end_page = chunk.get('end_page', 1)
-        
-        chunk_options = options.copy()
-        chunk_options['chunk_info'] = {
-            'start_page': chunk_start_page,
-            'end_page': chunk_end_page,
-            'page_count': chunk.get('page_count', chunk_end_page - chunk_start_page + 1),
-        }
+        chunk_options = _build_chunk_options(options, chunk)
         
         chunk_task = celery_app.send_task(
             'mineru.parse_document',
             args=[
                 chunk_file_path,
-                f"{Path(file_name).stem}_pages_{chunk_start_page}-{chunk_end_page}.pdf",
+                f"{base_name}_pages_{chunk_start_page}-{chunk_end_page}.pdf",
                 backend,
                 chunk_options,
                 upload_images,
@@ -655,9 +1029,9 @@ def _handle_split_and_parse(
     merge_task = celery_app.send_task(
         'mineru.merge_chunk_results',
         args=[chunk_task_ids, file_name, backend],
-        queue=celeryconfig.MINERU_QUEUE,
+        queue=celeryconfig.MINERU_MERGE_QUEUE,
         exchange=celeryconfig.MINERU_EXCHANGE,
-        routing_key=celeryconfig.MINERU_ROUTING_KEY,
+        routing_key=celeryconfig.MINERU_MERGE_ROUTING_KEY,
     )
     
     # Update parent task state to indicate it's waiting for merge
@@ -674,17 +1048,14 @@ def _handle_split_and_parse(
     )
     
     # Wait for merge task to complete and return its result
-    from celery.result import AsyncResult
     result = AsyncResult(merge_task.id, app=celery_app)
     
-    # Poll for completion
-    import time
+    # Block on the result backend (Redis pub/sub) instead of a sleep/ready() loop.
+    # The merge task never waits on this task, so a synchronous wait is safe here.
     timeout = 7200  # 2 hours
-    start_time = time.time()
-    while not result.ready() and (time.time() - start_time) < timeout:
-        time.sleep(1)
-    
-    if not result.ready():
+    try:
+        result.get(timeout=timeout, interval=1.0, propagate=False, disable_sync_subtasks=False)
+    except CeleryTimeoutError:
         raise Exception(f"Merge task timed out after {timeout} seconds")
     
     if result.successful():
@@ -697,128 +1068,147 @@ def _handle_split_and_parse(
         raise Exception(f"Merge task failed: {result.result}")
 
 
+def _load_chunk_content_list(chunk_result: Dict[str, Any]) -> Optional[Any]:
+    """Load a chunk's content_list from output storage when it was too large to be put in the result"""
+    content_list_key = (chunk_result.get('json_files') or {}).get('content_list_json')
+    if not content_list_key:
+        return None
+    try:
+        return _json_loads(get_storage().read_output_file(content_list_key))
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load chunk content_list from storage {content_list_key}: {e}")
+        return None
+
+
+def _offset_content_items(items: List[Any], page_offset: int):
+    """Yield content_list items with their page key shifted by page_offset (items are updated in place)"""
+    for item in items:
+        if isinstance(item, dict):
+            for key in CONTENT_LIST_PAGE_KEYS:
+                if key in item:
+                    item[key] += page_offset
+                    break
+        yield item
+
+
 def _merge_chunk_results_from_results(
     chunk_results: List[Dict[str, Any]],
     file_name: str,
     backend: str,
     task_id: str,
 ) -> Dict[str, Any]:
+    """
+    Merge parsed chunk results into a single document result
+    
+    chunk_results is consumed: it is sorted in place, content_list items are
+    re-paged in place and moved into the merged content_list, and each chunk's
+    markdown content is released once it has been written to the merged document.
+    A chunk's markdown is taken from data['content'], or read from
+    data['content_path'] when the merge task spooled it to disk.
+    """
+    import shutil
+    import tempfile
+
     chunk_results.sort(key=lambda x: x.get('start_page', 1))
 
-    merged_md_parts = []
     merged_images = []
     merged_content_list = []
     total_images = 0
+    has_base64_images = False
+    has_images = False
     content_list_format = None
     content_list_meta = None
+    chunk_count = len(chunk_results)
+    images_uploaded = False
 
-    for idx, chunk_result in enumerate(chunk_results):
-        chunk_data = chunk_result.get('data', {})
-        chunk_md = chunk_data.get('content') or ''
-        chunk_start_page = chunk_result.get('start_page', 1)
-        chunk_end_page = chunk_result.get('end_page', 1)
-
-        logger.info(f"📦 Merging chunk {idx+1}/{len(chunk_results)}: pages {chunk_start_page}-{chunk_end_page}, content_length={len(chunk_md)}, has_content_list={chunk_result.get('content_list') is not None}, has_images={len(chunk_data.get('images', []))}")
-
-        merged_md_parts.append(chunk_md)
-
-        chunk_images = chunk_data.get('images', [])
-        merged_images.extend(chunk_images)
-        total_images += len(chunk_images)
-
-        chunk_content_list = chunk_result.get('content_list')
-        if chunk_content_list:
-            if content_list_format is None:
-                if isinstance(chunk_content_list, dict):
-                    if 'pages' in chunk_content_list:
-                        content_list_format = 'pages'
-                        content_list_meta = {k: v for k, v in chunk_content_list.items() if k != 'pages'}
-                    elif 'items' in chunk_content_list:
-                        content_list_format = 'items'
-                        content_list_meta = {k: v for k, v in chunk_content_list.items() if k != 'items'}
-                    else:
-                        content_list_format = 'list'
-                else:
-                    content_list_format = 'list'
-
-            page_offset = chunk_start_page - 1
-
-            if isinstance(chunk_content_list, list):
-                for item in chunk_content_list:
-                    if isinstance(item, dict):
-                        merged_item = item.copy()
-                        if 'page_idx' in merged_item:
-                            merged_item['page_idx'] += page_offset
-                        if 'page_number' in merged_item:
-                            merged_item['page_number'] += page_offset
-                        if 'page' in merged_item:
-                            merged_item['page'] += page_offset
-                        if 'page_index' in merged_item:
-                            merged_item['page_index'] += page_offset
-                        if 'page_num' in merged_item:
-                            merged_item['page_num'] += page_offset
-                    else:
-                        merged_item = item
-                    merged_content_list.append(merged_item)
-            elif isinstance(chunk_content_list, dict):
-                if 'pages' in chunk_content_list:
-                    for page in chunk_content_list['pages']:
-                        if isinstance(page, dict):
-                            merged_page = page.copy()
-                            if 'page_idx' in merged_page:
-                                merged_page['page_idx'] += page_offset
-                            if 'page_number' in merged_page:
-                                merged_page['page_number'] += page_offset
-                            if 'page' in merged_page:
-                                merged_page['page'] += page_offset
-                            merged_content_list.append(merged_page)
-                        else:
-                            merged_content_list.append(page)
-                elif 'items' in chunk_content_list:
-                    for item in chunk_content_list['items']:
-                        if isinstance(item, dict):
-                            merged_item = item.copy()
-                            if 'page_idx' in merged_item:
-                                merged_item['page_idx'] += page_offset
-                            if 'page_number' in merged_item:
-                                merged_item['page_number'] += page_offset
-                            if 'page' in merged_item:
-                                merged_item['page'] += page_offset
-                            merged_content_list.append(merged_item)
+    storage = get_storage()
+
+    temp_output_dir = tempfile.mkdtemp()
+    output_path = Path(temp_output_dir) / task_id
+    output_path.mkdir(parents=True, exist_ok=True)
+    md_output = output_path / "result.md"
+
+    try:
+        # Chunk markdown is written straight into result.md one chunk at a time and the document
+        # is read back once, so only the current chunk and the final document are held in memory
+        with open(md_output, 'w', encoding='utf-8') as merged_md_file:
+            for idx, chunk_result in enumerate(chunk_results):
+                chunk_data = chunk_result.get('data', {})
+                chunk_md = chunk_data.pop('content', None)
+                content_path = chunk_data.pop('content_path', None)
+                if chunk_md is None and content_path:
+                    chunk_md = Path(content_path).read_text(encoding='utf-8')
+                chunk_md = chunk_md or ''
+                chunk_start_page = chunk_result.get('start_page', 1)
+                chunk_end_page = chunk_result.get('end_page', 1)
+                chunk_images = chunk_data.get('images') or ()
+                chunk_content_list = chunk_result.get('content_list')
+
+                logger.info(
+                    "📦 Merging chunk %d/%d: pages %d-%d, content_length=%d, has_content_list=%s, has_images=%d",
+                    idx + 1, chunk_count, chunk_start_page, chunk_end_page, len(chunk_md),
+                    chunk_content_list is not None, len(chunk_images),
+                )
+
+                merged_md_file.write(chunk_md)
+                # Each chunk task reports whether it inlined images, so the markdown is not scanned
+                has_base64_images = has_base64_images or chunk_data.get('images_as_base64', False)
+                del chunk_md
+
+                merged_images.extend(chunk_images)
+                total_images += len(chunk_images)
+                has_images = has_images or bool(chunk_images) or chunk_data.get('has_images', False)
+                images_uploaded = images_uploaded or chunk_data.get('images_uploaded', False)
+
+                if chunk_content_list is None:
+                    chunk_content_list = _load_chunk_content_list(chunk_result)
+                if chunk_content_list:
+                    if content_list_format is None:
+                        if isinstance(chunk_content_list, dict):
+                            if 'pages' in chunk_content_list:
+                                content_list_format = 'pages'
+                                content_list_meta = {k: v for k, v in chunk_content_list.items() if k != 'pages'}
+                            elif 'items' in chunk_content_list:
+                                content_list_format = 'items'
+                                content_list_meta = {k: v for k, v in chunk_content_list.items() if k != 'items'}
+                            else:
+                                content_list_format = 'list'
                         else:
-                            merged_content_list.append(item)
-                else:
-                    logger.warning(f"Unexpected content_list structure in chunk pages {chunk_start_page}-{chunk_end_page}: {type(chunk_content_list)}")
-        else:
-            logger.warning(f"⚠️ Chunk pages {chunk_start_page}-{chunk_end_page} has no content_list")
+                            content_list_format = 'list'
 
-    merged_md = ''.join(merged_md_parts)
-    has_base64_images = 'data:image' in merged_md
+                    page_offset = chunk_start_page - 1
 
-    logger.info(f"✅ Merged {len(chunk_results)} chunks successfully")
-    logger.info(f"📊 Merge statistics: total_content_length={len(merged_md)}, total_images={total_images}, total_content_list_items={len(merged_content_list)}")
+                    if isinstance(chunk_content_list, list):
+                        source_items = chunk_content_list
+                    elif isinstance(chunk_content_list, dict):
+                        source_items = chunk_content_list.get('pages')
+                        if source_items is None:
+                            source_items = chunk_content_list.get('items')
+                    else:
+                        source_items = None
 
-    parse_method = chunk_results[0].get('parse_method', 'MinerU') if chunk_results else 'MinerU'
+                    if source_items is not None:
+                        merged_content_list.extend(
+                            _offset_content_items(source_items, page_offset)
+                        )
+                    else:
+                        logger.warning("Unexpected content_list structure in chunk pages %d-%d: %s", chunk_start_page, chunk_end_page, type(chunk_content_list))
+                else:
+                    logger.warning("⚠️ Chunk pages %d-%d has no content_list", chunk_start_page, chunk_end_page)
 
-    storage = get_storage()
-    import tempfile
+        merged_md = md_output.read_text(encoding='utf-8')
 
-    with tempfile.TemporaryDirectory() as temp_output_dir:
-        output_path = Path(temp_output_dir) / task_id
-        output_path.mkdir(parents=True, exist_ok=True)
+        logger.info(f"✅ Merged {len(chunk_results)} chunks successfully")
+        logger.info(f"📊 Merge statistics: total_content_length={len(merged_md)}, total_images={total_images}, total_content_list_items={len(merged_content_list)}")
 
-        md_output = output_path / "result.md"
-        md_output.write_text(merged_md, encoding='utf-8')
+        parse_method = chunk_results[0].get('parse_method', 'MinerU') if chunk_results else 'MinerU'
 
         output_key_prefix = f"{task_id}/"
-        for file_path_obj in output_path.rglob('*'):
-            if file_path_obj.is_file():
-                relative_path = file_path_obj.relative_to(output_path)
-                storage_key = f"{output_key_prefix}{relative_path}"
-                storage.save_output_file(storage_key, file_path_obj.read_bytes())
+        upload_output_dir(output_path, output_key_prefix)
 
         if merged_images:
-            merged_images.sort(key=lambda img: img.get('filename', '') if isinstance(img, dict) else '')
+            # Entries come from build_images_list, which always sets 'filename'
+            merged_images.sort(key=itemgetter('filename'))
 
         if merged_content_list:
             if content_list_format == 'pages':
@@ -830,8 +1220,6 @@ def _merge_chunk_results_from_results(
         else:
             final_content_list = None
 
-        images_uploaded = chunk_results[0].get('data', {}).get('images_uploaded', False) if chunk_results else False
-
         result = {
             'status': 'completed',
             'file_name': file_name,
@@ -842,29 +1230,35 @@ def _merge_chunk_results_from_results(
                 'content': merged_md,
                 'images_uploaded': images_uploaded,
                 'images_as_base64': has_base64_images,
-                'has_images': total_images > 0,
+                'has_images': has_images,
                 'images': merged_images
             }
         }
 
         if final_content_list is not None:
             base_name = Path(file_name).stem
-            content_list_json = output_path / f"{base_name}/auto/{base_name}_content_list.json"
-            content_list_json.parent.mkdir(parents=True, exist_ok=True)
-            content_list_json.write_text(json.dumps(final_content_list, indent=2, ensure_ascii=False), encoding='utf-8')
-
+            # Serialized once and handed straight to storage; the temp output dir is discarded
+            # after the merge, so a local copy would only be written and read back
             content_list_storage_key = f"{output_key_prefix}{base_name}/auto/{base_name}_content_list.json"
-            storage.save_output_file(content_list_storage_key, content_list_json.read_bytes())
+            content_list_payload = _json_dumps(final_content_list, indent=True)
+            storage.save_output_file(content_list_storage_key, content_list_payload)
 
             result['json_files'] = {
                 'content_list_json': content_list_storage_key
             }
-            result['content_list'] = final_content_list
+            if len(content_list_payload) <= MINERU_INLINE_CONTENT_LIST_MAX_BYTES:
+                result['content_list'] = final_content_list
+            del content_list_payload
+    finally:
+        shutil.rmtree(temp_output_dir, ignore_errors=True)
 
-    final_content_length = len(result.get('data', {}).get('content', ''))
+    final_content_length = len(merged_md)
     final_content_list_count = len(result.get('content_list', [])) if result.get('content_list') is not None else 0
     logger.info(f"✅ Merge completed: content_length={final_content_length}, content_list_items={final_content_list_count}, has_json_files={'json_files' in result}")
 
+    # Drop the per-chunk results (consumed, see docstring); the calling task reclaims the memory
+    chunk_results.clear()
+
     return result
 
 
@@ -887,10 +1281,11 @@ def _execute_parse_document(
     options.update({
         'f_dump_content_list': True
     })
-    options.setdefault('formula_enable', os.getenv('MINERU_FORMULA_ENABLE', 'true').lower() == 'true')
-    options.setdefault('table_enable', os.getenv('MINERU_TABLE_ENABLE', 'true').lower() == 'true')
-    options.setdefault('method', os.getenv('MINERU_PARSE_METHOD', 'auto'))
-    options.setdefault('lang', os.getenv('MINERU_LANG', 'ch'))
+    options.setdefault('formula_enable', MINERU_FORMULA_ENABLE)
+    options.setdefault('table_enable', MINERU_TABLE_ENABLE)
+    options.setdefault('method', MINERU_DEFAULT_PARSE_METHOD)
+    options.setdefault('lang', MINERU_DEFAULT_LANG)
+    base_name = Path(file_name).stem
     
     logger.info(f"Starting MinerU document parsing task: {file_name}")
     
@@ -939,83 +1334,73 @@ def _execute_parse_document(
                     raise Exception("No markdown files generated")
                 
                 md_file = md_files[0]
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    md_content = f.read()
+                md_content = md_file.read_text(encoding='utf-8')
+                has_base64_images = False
+                images_uploaded = False
                 
                 # Process images (always process, default to base64 conversion)
                 image_dir = md_file.parent / 'images'
                 if image_dir.exists():
-                    embed_images = os.getenv('MINERU_EMBED_IMAGES_IN_MD', 'true').lower() == 'true'
+                    embed_images = MINERU_EMBED_IMAGES_IN_MD
+                    if embed_images and not upload_images and not MINERU_INLINE_IMAGES_BASE64 and get_minio_client():
+                        # Link images from object storage instead of inlining base64 when MinIO is configured
+                        upload_images = True
                     if embed_images or upload_images:
                         logger.info(f"🖼️ Processing images for task {task_id}")
-                        md_content = process_markdown_images(md_content, image_dir, upload_images)
-                        with open(md_file, 'w', encoding='utf-8') as f:
-                            f.write(md_content)
+                        md_content, has_base64_images, images_uploaded = process_markdown_images(
+                            md_content, image_dir, upload_images
+                        )
+                        md_file.write_text(md_content, encoding='utf-8')
                         logger.info(f"✅ Updated markdown file with processed images: {md_file}")
                 
                 # Upload all output files to storage
                 output_key_prefix = f"{task_id}/"
-                for file_path_obj in output_path.rglob('*'):
-                    if file_path_obj.is_file():
-                        relative_path = file_path_obj.relative_to(output_path)
-                        storage_key = f"{output_key_prefix}{relative_path}"
-                        storage.save_output_file(storage_key, file_path_obj.read_bytes())
-                        logger.debug(f"Uploaded output file: {storage_key}")
+                upload_output_dir(output_path, output_key_prefix)
                 
-                # Build images_base64 list for JSON response
+                # Build images_base64 list for JSON response. Images actually uploaded are
+                # already linked from the markdown, so they are not sent again as base64.
                 images_list = []
+                has_images = False
                 try:
                     if image_dir.exists():
-                        return_images = os.getenv('MINERU_RETURN_IMAGES_BASE64', 'true').lower() == 'true'
-                        if return_images:
-                            import base64
-                            import mimetypes
-                            for img_path in sorted(image_dir.iterdir()):
-                                if not img_path.is_file():
-                                    continue
-                                try:
-                                    with open(img_path, 'rb') as img_file:
-                                        img_data = img_file.read()
-                                    mime_type, _ = mimetypes.guess_type(str(img_path))
-                                    if not mime_type or not mime_type.startswith('image/'):
-                                        ext = img_path.suffix.lower()
-                                        mime_type = MIME_TYPE_MAP.get(ext, 'image/png')
-                                    data_url = f"data:{mime_type};base64,{base64.b64encode(img_data).decode('utf-8')}"
-                                    images_list.append({
-                                        'filename': img_path.name,
-                                        'mime_type': mime_type,
-                                        'size_bytes': len(img_data),
-                                        'data_url': data_url,
-                                    })
-                                except Exception as e:
-                                    logger.warning(f"Failed to build base64 for image {img_path}: {e}")
+                        has_images = any(image_dir.iterdir())
+                        if MINERU_RETURN_IMAGES_BASE64 and not images_uploaded:
+                            images_list = build_images_list(image_dir)
                 except Exception as e:
                     logger.warning(f"Failed to enumerate images for task {task_id}: {e}")
                 
-                # Collect JSON file paths (if they exist)
+                # Collect JSON file paths (if they exist); the files themselves were
+                # uploaded with the rest of the output directory above
                 json_files: dict[str, str] = {}
+                content_list_data = None
                 if parse_method == 'MinerU':
                     # Find JSON files generated by MinerU
-                    base_name = Path(file_name).stem
                     auto_dir = output_path / base_name / "auto"
 
                     # 1) content_list.json (rich text content list)
                     content_list_json = auto_dir / f"{base_name}_content_list.json"
                     if content_list_json.exists():
                         json_storage_key = f"{output_key_prefix}{base_name}/auto/{content_list_json.name}"
-                        storage.save_output_file(json_storage_key, content_list_json.read_bytes())
                         json_files["content_list_json"] = json_storage_key
+                        
+                        # Load content_list from the local output (for chunk tasks to merge) while it
+                        # still exists, rather than fetching the uploaded copy back from storage.
+                        # Large lists stay in storage only, keeping the result backend payload small.
+                        try:
+                            if content_list_json.stat().st_size <= MINERU_INLINE_CONTENT_LIST_MAX_BYTES:
+                                content_list_data = _json_loads(content_list_json.read_bytes())
+                                logger.debug(f"✅ Loaded content_list from {content_list_json}: {len(content_list_data) if isinstance(content_list_data, list) else 'dict'} items")
+                            else:
+                                logger.debug(f"content_list for task {task_id} exceeds MINERU_INLINE_CONTENT_LIST_MAX_BYTES, returning it via json_files only")
+                        except Exception as e:
+                            logger.warning(f"⚠️ Failed to load content_list from JSON file: {e}")
 
                     # 2) middle.json (layout analysis with discarded_blocks: header/footer/page_number)
                     middle_json = auto_dir / f"{base_name}_middle.json"
                     if middle_json.exists():
                         middle_storage_key = f"{output_key_prefix}{base_name}/auto/{middle_json.name}"
-                        storage.save_output_file(middle_storage_key, middle_json.read_bytes())
                         json_files["middle_json_json"] = middle_storage_key
                 
-                # Check if markdown content contains Base64 images
-                has_base64_images = 'data:image' in md_content
-                
         finally:
             # Clean up temporary input file
             try:
@@ -1030,26 +1415,6 @@ def _execute_parse_document(
             except Exception as e:
                 logger.warning(f"Failed to cleanup storage temp file {file_path}: {e}")
         
-        # Load content_list from JSON file if it exists (for chunk tasks to merge)
-        content_list_data = None
-        if json_files and 'content_list_json' in json_files:
-            try:
-                content_list_path = json_files['content_list_json']
-                # If it's a storage path, download it first
-                if not Path(content_list_path).exists():
-                    # Try to load from storage
-                    storage = get_storage()
-                    if hasattr(storage, 'download_to_local'):
-                        local_path = storage.download_to_local(content_list_path)
-                        content_list_path = local_path
-                
-                if Path(content_list_path).exists():
-                    with open(content_list_path, 'r', encoding='utf-8') as f:
-                        content_list_data = json.load(f)
-                        logger.debug(f"✅ Loaded content_list from {content_list_path}: {len(content_list_data) if isinstance(content_list_data, list) else 'dict'} items")
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to load content_list from JSON file: {e}")
-        
         # Return result
         result = {
             'status': 'completed',
@@ -1059,9 +1424,9 @@ def _execute_parse_document(
             'completed_at': datetime.now().isoformat(),
             'data': {
                 'content': md_content,
-                'images_uploaded': upload_images,
+                'images_uploaded': images_uploaded,
                 'images_as_base64': has_base64_images,
-                'has_images': len(images_list) > 0,
+                'has_images': has_images,
                 'images': images_list
             }
         }
@@ -1070,6 +1435,12 @@ def _execute_parse_document(
         if json_files:
             result['json_files'] = json_files
         
+        # Chunk tasks report their page range so the merge does not need the task's options
+        chunk_info = options.get('chunk_info')
+        if chunk_info:
+            result['start_page'] = chunk_info.get('start_page', 1)
+            result['end_page'] = chunk_info.get('end_page', 1)
+        
         # Add content_list directly to result (for merge task to use)
         if content_list_data is not None:
             result['content_list'] = content_list_data
@@ -1092,7 +1463,7 @@ def _execute_parse_document(
             'file_name': file_name,
             'backend': backend,
             'error_message': str(e),
-            'traceback': traceback.format_exc(),
+            'error_type': type(e).__name__,
             'completed_at': datetime.now().isoformat()
         }
 
@@ -1133,7 +1504,10 @@ def _parse_with_mineru(
         f_dump_content_list = True
         logger.info(f"🔧 JSON output options: content_list={f_dump_content_list}")
         
-        # Execute parsing
+        # Execute parsing. The lock is needed for every backend: do_parse rewrites the input
+        # with pypdfium2 and renders page images through it for pipeline and vlm alike, and
+        # pdfium cannot be used from two threads at once. A worker therefore runs one parse at a
+        # time; parse in parallel by running more worker processes or containers.
         with pypdfium2_lock:
             do_parse(
                 output_dir=str(output_path),
@@ -1156,19 +1530,6 @@ def _parse_with_mineru(
             clean_memory()
         except Exception as e:
             logger.debug(f"Memory cleanup failed for task {task_id}: {e}")
-        try:
-            if pdf_bytes:
-                del pdf_bytes
-        except Exception:
-            pass
-        try:
-            gc.collect()
-        except Exception:
-            pass
-        try:
-            gc.collect()
-        except Exception:
-            pass
 
 
 def _parse_with_markitdown(
@@ -1209,9 +1570,9 @@ def get_task_result(task_id: str, upload_images: bool = False) -> Dict[str, Any]
     Returns:
         dict: Task status and result information, compatible with original API format
     """
+    now = datetime.now().isoformat()
     try:
         # Get Celery task result
-        from celery.result import AsyncResult
         result = AsyncResult(task_id, app=celery_app)
         
         # Map Celery status to original API status
@@ -1241,7 +1602,7 @@ def get_task_result(task_id: str, upload_images: bool = False) -> Dict[str, Any]
                 'error_message': None,
                 'retry_count': getattr(result, 'retries', 0)
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now
         }
         
         if result.successful():
@@ -1281,8 +1642,7 @@ def get_task_result(task_id: str, upload_images: bool = False) -> Dict[str, Any]
                         # Check if it's a local file path that exists
                         p = Path(path_str)
                         if p.exists() and p.is_absolute():
-                            with open(p, 'r', encoding='utf-8') as f:
-                                return json.load(f)
+                            return _json_loads(p.read_bytes())
                         # Storage path - read from storage
                         try:
                             storage = get_storage()
@@ -1297,7 +1657,7 @@ def get_task_result(task_id: str, upload_images: bool = False) -> Dict[str, Any]
 
                             json_bytes = storage.read_file(full_path)
                             if json_bytes:
-                                return json.loads(json_bytes.decode('utf-8'))
+                                return _json_loads(json_bytes)
                         except Exception as e:
                             logger.debug(f"Failed to load JSON from storage path {path_str}: {e}")
                             return None
@@ -1329,19 +1689,19 @@ def get_task_result(task_id: str, upload_images: bool = False) -> Dict[str, Any]
             error_info = result.result if result.result else result.traceback
             response['task'].update({
                 'error_message': str(error_info) if error_info else 'Unknown error',
-                'completed_at': datetime.now().isoformat()
+                'completed_at': now
             })
             
         elif api_status == 'processing':
             # Task in progress, try to get progress information
-            if hasattr(result, 'info') and result.info:
-                progress_info = result.info
-                if isinstance(progress_info, dict):
-                    response['task'].update({
-                        'file_name': progress_info.get('file_name'),
-                        'backend': progress_info.get('backend'),
-                        'started_at': progress_info.get('started_at')
-                    })
+            # (info is not cached for unfinished tasks, every access queries the backend)
+            progress_info = result.info
+            if isinstance(progress_info, dict):
+                response['task'].update({
+                    'file_name': progress_info.get('file_name'),
+                    'backend': progress_info.get('backend'),
+                    'started_at': progress_info.get('started_at')
+                })
         
         return response
         
@@ -1355,7 +1715,7 @@ def get_task_result(task_id: str, upload_images: bool = False) -> Dict[str, Any]
                 'status': 'unknown',
                 'error_message': str(e)
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now
         }
 
 
@@ -1366,19 +1726,16 @@ def get_queue_stats():
     Returns:
         dict: Queue statistics
     """
+    now = datetime.now().isoformat()
     try:
         inspect = celery_app.control.inspect()
         
-        # Get active tasks
-        active_tasks = inspect.active() or {}
+        # Get active, waiting and reserved tasks (independent broadcasts, issued together)
+        active_tasks, scheduled_tasks, reserved_tasks = inspect_concurrently(
+            inspect, 'active', 'scheduled', 'reserved'
+        )
         active_count = sum(len(tasks) for tasks in active_tasks.values())
-        
-        # Get waiting tasks
-        scheduled_tasks = inspect.scheduled() or {}
         pending_count = sum(len(tasks) for tasks in scheduled_tasks.values())
-        
-        # Get reserved tasks
-        reserved_tasks = inspect.reserved() or {}
         reserved_count = sum(len(tasks) for tasks in reserved_tasks.values())
         
         return {
@@ -1393,9 +1750,11 @@ def get_queue_stats():
             },
             'workers': {
                 'active_workers': len(active_tasks),
-                'total_workers': len(inspect.stats() or {})
+                # Every responding worker replies to these broadcasts (idle ones with an empty
+                # list), so their union covers the workers a separate stats() call would find
+                'total_workers': len(set(active_tasks) | set(scheduled_tasks) | set(reserved_tasks))
             },
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now,
             'note': 'Completed/failed counts not available in Celery. Only active tasks are tracked.'
         }
         
@@ -1410,7 +1769,7 @@ def get_queue_stats():
                 'completed': 0,
                 'failed': 0
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now
         }
 
 
@@ -1425,21 +1784,31 @@ def list_tasks(status_filter: str = None, limit: int = 100):
     Returns:
         dict: Task list
     """
+    now = datetime.now().isoformat()
     try:
         inspect = celery_app.control.inspect()
         tasks = []
         
-        # Get active tasks
+        # Query active and waiting tasks together, as the status filter requires
+        queries = []
         if not status_filter or status_filter == 'processing':
-            active_tasks = inspect.active() or {}
+            queries.append('active')
+        if not status_filter or status_filter == 'pending':
+            queries.append('scheduled')
+        replies = dict(zip(queries, inspect_concurrently(inspect, *queries))) if queries else {}
+        
+        # Get active tasks (stop building entries once the limit is reached)
+        if 'active' in replies:
+            active_tasks = replies['active']
             for worker, worker_tasks in active_tasks.items():
-                for task in worker_tasks:
+                for task in worker_tasks[:limit - len(tasks)]:
+                    task_kwargs = task.get('kwargs') or {}
                     task_info = {
                         'task_id': task['id'],
                         'status': 'processing',
                         'worker_id': worker,
-                        'file_name': task.get('kwargs', {}).get('file_name'),
-                        'backend': task.get('kwargs', {}).get('backend'),
+                        'file_name': task_kwargs.get('file_name'),
+                        'backend': task_kwargs.get('backend'),
                         'started_at': task.get('time_start'),
                         'created_at': None,
                         'priority': 0
@@ -1447,16 +1816,18 @@ def list_tasks(status_filter: str = None, limit: int = 100):
                     tasks.append(task_info)
         
         # Get waiting tasks
-        if not status_filter or status_filter == 'pending':
-            scheduled_tasks = inspect.scheduled() or {}
+        if 'scheduled' in replies and len(tasks) < limit:
+            scheduled_tasks = replies['scheduled']
             for worker, worker_tasks in scheduled_tasks.items():
-                for task in worker_tasks:
+                for task in worker_tasks[:limit - len(tasks)]:
+                    request = task['request']
+                    task_kwargs = request.get('kwargs') or {}
                     task_info = {
-                        'task_id': task['request']['id'],
+                        'task_id': request['id'],
                         'status': 'pending',
                         'worker_id': None,
-                        'file_name': task['request'].get('kwargs', {}).get('file_name'),
-                        'backend': task['request'].get('kwargs', {}).get('backend'),
+                        'file_name': task_kwargs.get('file_name'),
+                        'backend': task_kwargs.get('backend'),
                         'created_at': None,
                         'started_at': None,
                         'priority': task.get('priority', 0),
@@ -1464,16 +1835,13 @@ def list_tasks(status_filter: str = None, limit: int = 100):
                     }
                     tasks.append(task_info)
         
-        # Limit return count
-        tasks = tasks[:limit]
-        
         return {
             'success': True,
             'tasks': tasks,
             'count': len(tasks),
             'limit': limit,
             'status_filter': status_filter,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now,
             'note': 'Only active and scheduled tasks are shown. Historical tasks are not stored by default.'
         }
         
@@ -1484,9 +1852,45 @@ def list_tasks(status_filter: str = None, limit: int = 100):
             'error': str(e),
             'tasks': [],
             'count': 0,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now
         }
 
+def _iter_finished_task_metas(task_ids: List[str], timeout: float, interval: float = 1.0):
+    """
+    Yield (task_id, meta) for tasks as they finish, in completion order
+    
+    Backends with native join support (Redis pub/sub, bulk MGET for key/value stores) are
+    waited on through ResultSet.iter_native. Other backends (e.g. database) have no bulk
+    fetch, so pending tasks are polled with their meta fetched concurrently each round.
+    
+    Raises:
+        celery.exceptions.TimeoutError: If tasks are still pending after timeout seconds
+    """
+    result_set = ResultSet([AsyncResult(task_id, app=celery_app) for task_id in task_ids], app=celery_app)
+    if result_set.supports_native_join:
+        yield from result_set.iter_native(timeout=timeout, interval=interval)
+        return
+
+    import time
+
+    backend = celery_app.backend
+    pending = list(dict.fromkeys(task_ids))
+    deadline = time.monotonic() + timeout
+    with ThreadPoolExecutor(max_workers=min(16, len(pending))) as executor:
+        while pending:
+            still_pending = []
+            for task_id, meta in zip(pending, executor.map(backend.get_task_meta, pending)):
+                if meta['status'] in states.READY_STATES:
+                    yield task_id, meta
+                else:
+                    still_pending.append(task_id)
+            pending = still_pending
+            if pending:
+                if time.monotonic() >= deadline:
+                    raise CeleryTimeoutError(f"{len(pending)} tasks still pending after {timeout} seconds")
+                time.sleep(interval)
+
+
 @celery_app.task(
     name='mineru.merge_chunk_results',
     bind=True,
@@ -1523,108 +1927,106 @@ def merge_chunk_results_task(
         }
     )
     
+    import shutil
+    import tempfile
+
+    # Chunk markdown is spooled here as results arrive so the merge worker does not hold
+    # every chunk's content in memory while waiting for the slowest chunk
+    spool_dir = Path(tempfile.mkdtemp(prefix=f"mineru_merge_{task_id}_"))
+    
     try:
-        from celery.result import AsyncResult
-        
         # Wait for all chunk tasks to complete
         chunk_results = []
-        failed_chunks = []
+        first_error = None
+        failure_count = 0
         
-        import time
-        for chunk_task_id in chunk_task_ids:
-            result = AsyncResult(chunk_task_id, app=celery_app)
-            
-            # Poll for result completion (avoiding result.get() which causes deadlock)
-            # Use ready() check with timeout
-            timeout = 3600  # 1 hour timeout per chunk
-            start_time = time.time()
-            while not result.ready() and (time.time() - start_time) < timeout:
-                time.sleep(0.5)  # Poll every 0.5 seconds
-            
-            if not result.ready():
-                failed_chunks.append({
-                    'task_id': chunk_task_id,
-                    'error': f'Task timeout after {timeout} seconds'
-                })
-                logger.error(f"Chunk task {chunk_task_id} timed out")
-                continue
-            
-            # Task is ready, check result
+        def _collect(chunk_task_id: str, state: str, payload: Any) -> Optional[str]:
+            """Record one finished chunk as a result to merge, returns the error message if it failed"""
             try:
-                if result.successful():
-                    chunk_result = result.result
+                if state == states.SUCCESS:
+                    chunk_result = payload
                     if chunk_result.get('status') == 'failed':
-                        failed_chunks.append({
-                            'task_id': chunk_task_id,
-                            'error': chunk_result.get('error_message', 'Unknown error')
-                        })
-                        logger.error(f"Chunk task {chunk_task_id} failed: {chunk_result.get('error_message')}")
+                        error_msg = chunk_result.get('error_message', 'Unknown error')
+                        logger.error("Chunk task %s failed: %s", chunk_task_id, error_msg)
+                        return error_msg
                     else:
                         # Verify chunk result has required fields
                         chunk_data = chunk_result.get('data', {})
                         chunk_content = chunk_data.get('content', '')
+                        content_length = len(chunk_content) if chunk_content else 0
+                        image_count = len(chunk_data.get('images', ()))
                         
-                        # Get page range from task metadata (chunk_info in options)
-                        chunk_start = -1
-                        chunk_end = -1
-                        
-                        # Try to get from task metadata
-                        task_info = result.info if hasattr(result, 'info') else {}
-                        if isinstance(task_info, dict):
-                            # Check if chunk_info is in options
-                            task_kwargs = task_info.get('kwargs', {})
-                            options = task_kwargs.get('options', {})
-                            chunk_info = options.get('chunk_info', {})
-                            if chunk_info:
-                                chunk_start = chunk_info.get('start_page', 1)
-                                chunk_end = chunk_info.get('end_page', 1)
-                                # Update chunk_result with page info for consistency
-                                chunk_result['start_page'] = chunk_start
-                                chunk_result['end_page'] = chunk_end
-                        
-                        # If still not found, try to get from result (backward compatibility)
-                        if chunk_start == -1 or chunk_end == -1:
-                            chunk_start = chunk_result.get('start_page', 1)
-                            chunk_end = chunk_result.get('end_page', 1)
+                        # Page range is carried in the chunk result (set from chunk_info by the chunk task)
+                        chunk_start = chunk_result.get('start_page', 1)
+                        chunk_end = chunk_result.get('end_page', 1)
                         
                         # Verify content is not None and not empty
                         if chunk_content is None:
-                            logger.error(f"❌ CRITICAL: Chunk {chunk_task_id} (pages {chunk_start}-{chunk_end}) has None content!")
+                            logger.error("❌ CRITICAL: Chunk %s (pages %d-%d) has None content!", chunk_task_id, chunk_start, chunk_end)
                         elif not chunk_content:
-                            logger.warning(f"⚠️ Chunk {chunk_task_id} (pages {chunk_start}-{chunk_end}) has empty content")
-                        else:
-                            # Log content preview for verification
-                            if len(chunk_content) > 200:
+                            logger.warning("⚠️ Chunk %s (pages %d-%d) has empty content", chunk_task_id, chunk_start, chunk_end)
+                        elif logger.isEnabledFor(logging.DEBUG):
+                            # Log content preview for verification (only sliced when debug logging is on)
+                            if content_length > 200:
                                 preview = chunk_content[:100] + "..." + chunk_content[-100:]
                             else:
                                 preview = chunk_content
-                            logger.debug(f"📄 Chunk {chunk_task_id} content preview: '{preview}'")
+                            logger.debug("📄 Chunk %s content preview: %r", chunk_task_id, preview)
+                        
+                        logger.info(
+                            "✅ Chunk %s (pages %d-%d): content_length=%d, has_content_list=%s, has_images=%d",
+                            chunk_task_id, chunk_start, chunk_end, content_length,
+                            chunk_result.get('content_list') is not None, image_count,
+                        )
                         
-                        logger.info(f"✅ Chunk {chunk_task_id} (pages {chunk_start}-{chunk_end}): content_length={len(chunk_content) if chunk_content else 0}, has_content_list={chunk_result.get('content_list') is not None}, has_images={len(chunk_data.get('images', []))}")
+                        # The result dict is also cached on the AsyncResult, so drop the
+                        # content from it rather than only from our own reference
+                        if chunk_content:
+                            content_path = spool_dir / f"{chunk_task_id}.md"
+                            content_path.write_text(chunk_content, encoding='utf-8')
+                            chunk_data['content_path'] = str(content_path)
+                        chunk_data.pop('content', None)
                         chunk_results.append(chunk_result)
-                elif result.failed():
-                    error_msg = str(result.result) if result.result else 'Unknown error'
-                    failed_chunks.append({
-                        'task_id': chunk_task_id,
-                        'error': error_msg
-                    })
-                    logger.error(f"Chunk task {chunk_task_id} failed: {error_msg}")
+                        return None
+                elif state == states.FAILURE:
+                    error_msg = str(payload) if payload else 'Unknown error'
+                    logger.error("Chunk task %s failed: %s", chunk_task_id, error_msg)
+                    return error_msg
                 else:
                     # Task is in an unexpected state
-                    failed_chunks.append({
-                        'task_id': chunk_task_id,
-                        'error': f'Task in state: {result.state}'
-                    })
-                    logger.error(f"Chunk task {chunk_task_id} in unexpected state: {result.state}")
+                    logger.error("Chunk task %s in unexpected state: %s", chunk_task_id, state)
+                    return f'Task in state: {state}'
             except Exception as e:
-                failed_chunks.append({
-                    'task_id': chunk_task_id,
-                    'error': str(e)
-                })
-                logger.error(f"Failed to process result for chunk task {chunk_task_id}: {e}")
+                logger.error("Failed to process result for chunk task %s: %s", chunk_task_id, e)
+                return str(e)
+        
+        # Handle chunks in the order they finish rather than the order they were submitted, so a
+        # slow early chunk does not hold up the ones already done
+        pending_chunk_ids = set(chunk_task_ids)
+        timeout = 3600 * len(chunk_task_ids)  # 1 hour per chunk
+        try:
+            for chunk_task_id, meta in _iter_finished_task_metas(chunk_task_ids, timeout):
+                if chunk_task_id not in pending_chunk_ids:
+                    continue
+                pending_chunk_ids.discard(chunk_task_id)
+                error_msg = _collect(chunk_task_id, meta['status'], meta['result'])
+                if error_msg is not None:
+                    failure_count += 1
+                    first_error = first_error or error_msg
+        except CeleryTimeoutError:
+            pass
+        
+        if pending_chunk_ids:
+            failure_count += len(pending_chunk_ids)
+            first_error = first_error or f'Task timeout after {timeout} seconds'
+            for chunk_task_id in chunk_task_ids:
+                if chunk_task_id in pending_chunk_ids:
+                    logger.error("Chunk task %s timed out", chunk_task_id)
         
         if not chunk_results:
-            raise Exception(f"All {len(chunk_task_ids)} chunks failed. First error: {failed_chunks[0]['error'] if failed_chunks else 'Unknown'}")
+            raise Exception(f"All {len(chunk_task_ids)} chunks failed. First error: {first_error or 'Unknown'}")
+        if failure_count:
+            logger.warning("⚠️ %d/%d chunks failed, merging the remaining chunks", failure_count, len(chunk_task_ids))
 
         return _merge_chunk_results_from_results(
             chunk_results=chunk_results,
@@ -1640,28 +2042,36 @@ def merge_chunk_results_task(
             'file_name': file_name,
             'backend': backend,
             'error_message': str(e),
-            'traceback': traceback.format_exc(),
+            'error_type': type(e).__name__,
             'completed_at': datetime.now().isoformat()
         }
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        # Long-lived workers otherwise keep the peak heap of the largest merge
+        _reclaim_memory()
 
 
 if __name__ == "__main__":
-    print("🚀 Starting MinerU Celery Worker...")
-    print(f"🏷️  Worker Name: {celeryconfig.WORKER_NAME}")
-    print(f"📋 Queue: {celeryconfig.task_default_queue}")
-    print(f"🔗 Broker: {celeryconfig.broker_url}")
-    print(f"💾 Backend: {celeryconfig.result_backend}")
-    print(f"⚙️  Concurrency: {celeryconfig.WORKER_CONCURRENCY}")
     worker_pool = celeryconfig.WORKER_POOL or 'prefork'
-    print(f"🧵 Pool: {worker_pool}")
-    print(f"⚠️  Note: This worker does NOT provide API")
-    print()
+    sys.stdout.write("\n".join([
+        "🚀 Starting MinerU Celery Worker...",
+        f"🏷️  Worker Name: {celeryconfig.WORKER_NAME}",
+        f"📋 Queues: {celeryconfig.WORKER_QUEUES}",
+        f"🔗 Broker: {celeryconfig.broker_url}",
+        f"💾 Backend: {celeryconfig.result_backend}",
+        f"⚙️  Concurrency: {celeryconfig.WORKER_CONCURRENCY}",
+        f"🧵 Pool: {worker_pool}",
+        "⚠️  Note: This worker does NOT provide API",
+        "",
+        "",
+    ]))
+    sys.stdout.flush()
 
     worker_args = [
         'worker',
         '--loglevel=INFO',
         '-n', f'{celeryconfig.WORKER_NAME}@%h',
-        '-Q', celeryconfig.task_default_queue,
+        '-Q', celeryconfig.WORKER_QUEUES,
         f'--concurrency={celeryconfig.WORKER_CONCURRENCY}',
         f'--max-memory-per-child={celeryconfig.worker_max_memory_per_child}'
     ]
@@ -1669,4 +2079,22 @@ if __name__ == "__main__":
     if celeryconfig.WORKER_POOL:
         worker_args.append(f'--pool={celeryconfig.WORKER_POOL}')
 
+    worker_queues = {queue.strip() for queue in celeryconfig.WORKER_QUEUES.split(',') if queue.strip()}
+    merge_only = (
+        worker_queues == {celeryconfig.MINERU_MERGE_QUEUE}
+        and celeryconfig.MINERU_MERGE_QUEUE != celeryconfig.MINERU_QUEUE
+    )
+    if merge_only:
+        # Dedicated merge worker: merges run for as long as their slowest chunk, so never reserve
+        # more than one per slot even if WORKER_PREFETCH_MULTIPLIER is raised for parsing workers
+        worker_args.append('--prefetch-multiplier=1')
+
+    if celeryconfig.WORKER_DISABLE_GOSSIP:
+        # Remote control (inspect/revoke) still works without these
+        worker_args.extend(['--without-gossip', '--without-mingle', '--without-heartbeat'])
+
+    # A dedicated merge worker never parses, so it does not need the models in memory
+    if not merge_only:
+        preload_models()
+
     celery_app.worker_main(worker_args)